@@ -1,3 +1,4 @@
 from .engine_registry import ENGINE_REGISTRY
 from .engine_router import ENGINE_ROUTER
+from .health_prober import HEALTH_PROBER
 from .context_manager import ContextManager
@@ -0,0 +1,148 @@
+import random
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import Config
+
+
+FIXED = "fixed"
+ADAPTIVE = "adaptive"
+
+
+def _parse_pins(raw: str) -> Dict[str, str]:
+    pins = {}
+    for item in raw.split(","):
+        guild_id, _, engine_id = item.partition(":")
+        if guild_id.strip() and engine_id.strip():
+            pins[guild_id.strip()] = engine_id.strip()
+    return pins
+
+
+class AdaptiveSelector:
+    """
+    Engine selection for EngineRouter's adaptive mode.
+
+    - Scores engines on rolling latency percentile (relative to the
+      fastest), error rate and scheduler load, with configurable weights
+    - Under-sampled engines are tried first; a small exploration share
+      (ROUTER_ADAPTIVE_EXPLORE) keeps losing engines' stats fresh
+    - Pinning: per-guild pins (ROUTER_PINS="guild:engine,...") and an
+      optional global pin override scoring
+    """
+
+    def __init__(self):
+        self.mode = str(Config.get("ROUTER_MODE", FIXED)).lower()
+        self.percentile = float(Config.get("ROUTER_ADAPTIVE_PERCENTILE", 0.9))
+        self.window = int(Config.get("ROUTER_ADAPTIVE_WINDOW", 100))
+        self.min_samples = int(Config.get("ROUTER_ADAPTIVE_MIN_SAMPLES", 10))
+        self.explore = float(Config.get("ROUTER_ADAPTIVE_EXPLORE", 0.05))
+        self.weights = {
+            "latency": float(Config.get("ROUTER_ADAPTIVE_W_LATENCY", 1.0)),
+            "errors": float(Config.get("ROUTER_ADAPTIVE_W_ERRORS", 4.0)),
+            "load": float(Config.get("ROUTER_ADAPTIVE_W_LOAD", 0.5)),
+        }
+        allowed = str(Config.get("ROUTER_ADAPTIVE_ENGINES", ""))
+        self.allowed = [e.strip() for e in allowed.split(",") if e.strip()]
+        self.pins = _parse_pins(str(Config.get("ROUTER_PINS", "")))
+        self.global_pin: Optional[str] = None
+
+        # (engine_id, kind) -> recent (latency, ok) outcomes
+        self._samples: Dict[Tuple[str, str], Deque[Tuple[float, bool]]] = (
+            defaultdict(lambda: deque(maxlen=self.window))
+        )
+        self.selections: Dict[str, int] = defaultdict(int)
+
+    @property
+    def adaptive(self) -> bool:
+        return self.mode == ADAPTIVE
+
+    def observe(
+        self,
+        engine_id: str,
+        latency: float,
+        kind: str,
+        ok: bool = True,
+    ) -> None:
+        """
+        kind is "generate" (full reply) or "first_token" (streaming).
+        """
+        self._samples[(engine_id, kind)].append((latency, ok))
+
+    def candidates(self, registered: List[str]) -> List[str]:
+        if not self.allowed:
+            return list(registered)
+        return [e for e in registered if e in self.allowed]
+
+    def stats(self, engine_id: str, kind: str) -> Optional[Dict[str, float]]:
+        samples = self._samples.get((engine_id, kind))
+        if not samples or len(samples) < self.min_samples:
+            return None
+
+        latencies = sorted(latency for latency, ok in samples if ok)
+        index = min(len(latencies) - 1, int(len(latencies) * self.percentile))
+        return {
+            # Nothing succeeded: treat as infinitely slow
+            "latency": latencies[index] if latencies else float("inf"),
+            "error_rate": sum(1 for _, ok in samples if not ok) / len(samples),
+        }
+
+    def pinned(self, guild_id: Optional[str]) -> Optional[str]:
+        if guild_id and guild_id in self.pins:
+            return self.pins[guild_id]
+        return self.global_pin
+
+    def choose(
+        self,
+        candidates: List[str],
+        kind: str,
+        load: Dict[str, float],
+    ) -> Optional[str]:
+        """
+        Lowest-scoring candidate; None when there are no candidates.
+        """
+        if not candidates:
+            return None
+
+        stats = {e: self.stats(e, kind) for e in candidates}
+        unknown = [e for e, s in stats.items() if s is None]
+        known = {e: s for e, s in stats.items() if s is not None}
+
+        if unknown:
+            # Sample every engine before trusting the scores
+            choice = min(
+                unknown,
+                key=lambda e: len(self._samples.get((e, kind), ())),
+            )
+        elif len(known) > 1 and random.random() < self.explore:
+            # Occasionally refresh the stats of engines that are losing
+            choice = random.choice(list(known))
+        else:
+            fastest = min(s["latency"] for s in known.values())
+            if fastest == float("inf"):
+                fastest = 1.0
+            fastest = fastest or 1e-6
+            choice = min(
+                known,
+                key=lambda e: (
+                    self.weights["latency"] * known[e]["latency"] / fastest
+                    + self.weights["errors"] * known[e]["error_rate"]
+                    + self.weights["load"] * load.get(e, 0.0)
+                ),
+            )
+
+        self.selections[choice] += 1
+        return choice
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "weights": self.weights,
+            "allowed": self.allowed,
+            "pins": self.pins,
+            "global_pin": self.global_pin,
+            "selections": dict(self.selections),
+            "engines": {
+                f"{engine_id}:{kind}": self.stats(engine_id, kind)
+                for engine_id, kind in self._samples
+            },
+        }
@@ -0,0 +1,168 @@
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+from app.core.config import Config
+from app.core.event_bus import EVENT_BUS
+from app.monitoring.logs import log
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-engine circuit breaker.
+
+    - CLOSED: traffic flows, outcomes are tracked in a rolling window
+    - OPEN: traffic is rejected until the cool-down expires
+    - HALF_OPEN: a few probe requests decide whether to close or re-open
+
+    Trips on either failure rate or slow-call rate over the window.
+    """
+
+    def __init__(self, engine_id: str):
+        self.engine_id = engine_id
+
+        self.window_size = int(Config.get("BREAKER_WINDOW", 20))
+        self.min_requests = int(Config.get("BREAKER_MIN_REQUESTS", 5))
+        self.failure_rate = float(Config.get("BREAKER_FAILURE_RATE", 0.5))
+        self.slow_call_seconds = float(
+            Config.get("BREAKER_SLOW_CALL_SECONDS", 30)
+        )
+        self.slow_call_rate = float(Config.get("BREAKER_SLOW_CALL_RATE", 0.8))
+        self.open_seconds = float(Config.get("BREAKER_OPEN_SECONDS", 30))
+        self.half_open_probes = int(Config.get("BREAKER_HALF_OPEN_PROBES", 2))
+
+        self.state = CLOSED
+        self.opened_at: float | None = None
+        self._window: Deque[Tuple[bool, float]] = deque(
+            maxlen=self.window_size
+        )
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.trips = 0
+
+    async def _transition(self, state: str, reason: str = "") -> None:
+        if state == self.state:
+            return
+
+        previous, self.state = self.state, state
+
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            self.trips += 1
+        if state in (HALF_OPEN, CLOSED):
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if state == CLOSED:
+            self._window.clear()
+
+        await log(
+            f"Circuit breaker {self.engine_id}: {previous} → {state}"
+            + (f" ({reason})" if reason else "")
+        )
+        await EVENT_BUS.emit(
+            "engine.breaker",
+            engine_id=self.engine_id,
+            state=state,
+        )
+
+    @property
+    def rejecting(self) -> bool:
+        """
+        Whether allow() would refuse right now (no state change).
+        """
+        if self.state == OPEN:
+            return time.monotonic() - self.opened_at < self.open_seconds
+        if self.state == HALF_OPEN:
+            return self._probes_in_flight >= self.half_open_probes
+        return False
+
+    async def allow(self) -> bool:
+        """
+        Whether a request may be sent to this engine right now.
+        A True result in HALF_OPEN reserves a probe slot; the caller
+        must report the outcome via record_success / record_failure.
+        """
+        if self.state == CLOSED:
+            return True
+
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            await self._transition(HALF_OPEN, "cool-down elapsed")
+
+        if self._probes_in_flight >= self.half_open_probes:
+            return False
+
+        self._probes_in_flight += 1
+        return True
+
+    def release(self) -> None:
+        """
+        Return a probe slot without an outcome (request was cancelled).
+        """
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    async def record_success(self, latency: float) -> None:
+        slow = latency >= self.slow_call_seconds
+
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if slow:
+                await self._transition(OPEN, f"slow probe {latency:.1f}s")
+                return
+
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                await self._transition(CLOSED, "probes succeeded")
+            return
+
+        self._window.append((True, latency))
+        await self._evaluate()
+
+    async def record_failure(self, latency: float) -> None:
+        if self.state == HALF_OPEN:
+            await self._transition(OPEN, "probe failed")
+            return
+
+        self._window.append((False, latency))
+        await self._evaluate()
+
+    async def _evaluate(self) -> None:
+        if self.state != CLOSED or len(self._window) < self.min_requests:
+            return
+
+        total = len(self._window)
+        failures = sum(1 for ok, _ in self._window if not ok)
+        slow = sum(
+            1 for _, latency in self._window
+            if latency >= self.slow_call_seconds
+        )
+
+        if failures / total >= self.failure_rate:
+            await self._transition(OPEN, f"failure rate {failures}/{total}")
+        elif slow / total >= self.slow_call_rate:
+            await self._transition(OPEN, f"slow calls {slow}/{total}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        total = len(self._window)
+        failures = sum(1 for ok, _ in self._window if not ok)
+        retry_in = None
+        if self.state == OPEN and self.opened_at is not None:
+            retry_in = max(
+                0.0,
+                self.open_seconds - (time.monotonic() - self.opened_at),
+            )
+
+        return {
+            "state": self.state,
+            "failure_rate": failures / total if total else 0.0,
+            "window": total,
+            "trips": self.trips,
+            "retry_in": retry_in,
+        }
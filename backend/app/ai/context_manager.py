@@ -1,19 +1,145 @@
-from typing import Dict, Any
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import Config
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast approximate token count (~4 characters per token).
+    """
+    return (len(text) + 3) // 4
+
+
+def _memory_line(item: Any) -> str:
+    if isinstance(item, str):
+        text = item
+    elif isinstance(item, dict) and "content" in item:
+        text = str(item["content"])
+    else:
+        text = json.dumps(item, sort_keys=True, separators=(",", ":"))
+    return "- " + " ".join(text.split())
 
 
 class ContextManager:
     """
-    Normalizes context before sending to engines.
+    Renders context into a compact, deterministic system prompt.
+
+    - Sections in priority order: style hint, top memories, mood
+    - Fits a per-engine token budget (CONTEXT_TOKEN_BUDGET[_<ENGINE>])
+    - Lower-priority content is truncated first
+    - Memories depend on the prompt, so they go in the user turn
+      (user_turn), keeping the system prompt a stable prefix that
+      engines can reuse across turns
     """
 
+    @staticmethod
+    def budget_for(engine_id: Optional[str]) -> int:
+        default = int(Config.get("CONTEXT_TOKEN_BUDGET", 512))
+        if not engine_id:
+            return default
+        return int(
+            Config.get(f"CONTEXT_TOKEN_BUDGET_{engine_id.upper()}", default)
+        )
+
+    @staticmethod
+    def _fit(lines: List[str], budget: int) -> List[str]:
+        kept, used = [], 0
+        for line in lines:
+            cost = estimate_tokens(line) + 1
+            if used + cost > budget:
+                remaining = (budget - used - 1) * 4
+                if remaining > 16:
+                    kept.append(line[: remaining - 1] + "…")
+                break
+            kept.append(line)
+            used += cost
+        return kept
+
+    @staticmethod
+    def render(
+        memory: Dict[str, Any],
+        personality: Dict[str, Any],
+        mood: Dict[str, Any],
+        budget: int,
+    ) -> Tuple[str, str]:
+        """
+        Returns (system prompt, memory block).
+        """
+        # Imported lazily: app.cognition pulls in app.memory
+        from app.cognition.personality import Personality
+
+        # (is memory, lines)
+        sections: List[Tuple[bool, List[str]]] = [
+            (False, [Personality(personality).style_hint()]),
+        ]
+
+        top_k = int(Config.get("CONTEXT_MAX_MEMORIES", 8))
+        for scope in sorted(memory):
+            # Stores return memories best-first
+            items = (memory[scope] or [])[:top_k]
+            if items:
+                sections.append((
+                    True,
+                    [f"{scope.capitalize()} memories:"]
+                    + [_memory_line(item) for item in items],
+                ))
+
+        if mood:
+            sections.append((
+                False,
+                [f"Mood: {mood.get('mood', 'neutral')} "
+                 f"({float(mood.get('intensity', 0.5)):.1f})"],
+            ))
+
+        system: List[str] = []
+        memories: List[str] = []
+        remaining = budget
+        for is_memory, section in sections:
+            fitted = ContextManager._fit(section, remaining)
+            # A memory header with no memories under it is noise;
+            # skip it, a later (shorter) section may still fit
+            if len(fitted) == 1 and len(section) > 1:
+                continue
+            (memories if is_memory else system).extend(fitted)
+            remaining -= sum(estimate_tokens(line) + 1 for line in fitted)
+            if remaining <= 0:
+                break
+
+        return "\n".join(system), "\n".join(memories)
+
+    @staticmethod
+    def user_turn(prompt: str, context: Dict[str, Any]) -> str:
+        """
+        The prompt as sent to the model, after the context's memories.
+        """
+        memory = context.get("memory")
+        return f"{memory}\n\n{prompt}" if memory else prompt
+
     @staticmethod
     def build(
         memory: Dict[str, Any],
         personality: Dict[str, Any],
         mood: Dict[str, Any],
+        engine_id: Optional[str] = None,
+        conversation: Optional[str] = None,
     ) -> Dict[str, Any]:
-        return {
-            "memory": memory,
-            "personality": personality,
-            "mood": mood,
+        """
+        `conversation` identifies a multi-turn chat (e.g. channel:user)
+        so engines can carry state between turns.
+        """
+        system, memories = ContextManager.render(
+            memory,
+            personality,
+            mood,
+            ContextManager.budget_for(engine_id),
+        )
+        context = {
+            "system": system,
+            "tokens": estimate_tokens(system) + estimate_tokens(memories),
         }
+        if memories:
+            context["memory"] = memories
+        if conversation:
+            context["conversation"] = conversation
+        return context
@@ -1,34 +1,184 @@
-from typing import Dict
-from .engines.base import BaseAIEngine
 import asyncio
+import contextlib
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Deque, Dict, Mapping, Optional, Set
+
+from app.core.config import Config
+from app.monitoring.logs import log
+from .engines.base import BaseAIEngine
+
+
+class EngineHandle:
+    """
+    One registered engine instance, versioned and reference-counted.
+    """
+
+    def __init__(self, engine: BaseAIEngine, version: int):
+        self.engine = engine
+        self.version = version
+        self.refs = 0
+        self.retired = False
+        self.drained = asyncio.Event()
+
+    def release(self) -> None:
+        self.refs -= 1
+        if self.retired and self.refs == 0:
+            self.drained.set()
+
+    def retire(self) -> None:
+        self.retired = True
+        if self.refs == 0:
+            self.drained.set()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "in_flight": self.refs,
+            "retired": self.retired,
+        }
 
 
 class EngineRegistry:
     """
     Runtime AI engine registry.
+
+    - Requests lease an engine handle for their whole call
+    - Re-registering an id swaps in the new instance at once; the old
+      one drains in-flight work (up to ENGINE_DRAIN_TIMEOUT) before
+      shutdown, off the request path
+    - Reads are lock-free: writers (serialized by the lock) publish a
+      new immutable snapshot instead of mutating the current one
     """
 
     def __init__(self):
-        self._engines: Dict[str, BaseAIEngine] = {}
+        self._handles: Mapping[str, EngineHandle] = MappingProxyType({})
+        self._engines: Mapping[str, BaseAIEngine] = MappingProxyType({})
+        self._retired: Set[EngineHandle] = set()
         self._lock = asyncio.Lock()
+        self._drains: Set[asyncio.Task] = set()
+        self.drain_timeout = float(Config.get("ENGINE_DRAIN_TIMEOUT", 60))
+        self.swaps: Deque[Dict[str, Any]] = deque(maxlen=50)
 
     async def register(self, engine: BaseAIEngine) -> None:
+        start = time.perf_counter()
+
+        # Start before publishing, so the first request finds it ready
+        await engine.start()
+
         async with self._lock:
-            self._engines[engine.engine_id] = engine
+            old = self._handles.get(engine.engine_id)
+            handle = EngineHandle(engine, old.version + 1 if old else 1)
+            self._publish({**self._handles, engine.engine_id: handle})
+
+        if old:
+            self._retire(old, swap_seconds=time.perf_counter() - start)
 
     async def unregister(self, engine_id: str) -> None:
         async with self._lock:
-            engine = self._engines.pop(engine_id, None)
-            if engine:
-                await engine.shutdown()
+            handles = dict(self._handles)
+            handle = handles.pop(engine_id, None)
+            self._publish(handles)
+
+        if handle:
+            self._retire(handle)
+
+    def _publish(self, handles: Dict[str, EngineHandle]) -> None:
+        # Both views are replaced whole; readers never see a partial update
+        self._handles = MappingProxyType(handles)
+        self._engines = MappingProxyType({
+            engine_id: handle.engine
+            for engine_id, handle in handles.items()
+        })
+
+    def _retire(
+        self,
+        handle: EngineHandle,
+        swap_seconds: Optional[float] = None,
+    ) -> None:
+        handle.retire()
+        self._retired.add(handle)
+        task = asyncio.create_task(self._drain(handle, swap_seconds))
+        self._drains.add(task)
+        task.add_done_callback(self._drains.discard)
+
+    async def _drain(
+        self,
+        handle: EngineHandle,
+        swap_seconds: Optional[float],
+    ) -> None:
+        start = time.perf_counter()
+        forced = False
+
+        try:
+            await asyncio.wait_for(handle.drained.wait(), self.drain_timeout)
+        except asyncio.TimeoutError:
+            forced = True
+            await log(
+                f"Engine {handle.engine.engine_id} v{handle.version} "
+                f"still has {handle.refs} in flight after "
+                f"{self.drain_timeout:.0f}s; shutting down anyway"
+            )
+
+        drain_seconds = time.perf_counter() - start
+        try:
+            await handle.engine.shutdown()
+        except Exception as e:
+            await log(f"Engine {handle.engine.engine_id} shutdown failed: {e}")
+        finally:
+            self._retired.discard(handle)
+
+        self.swaps.append({
+            "engine_id": handle.engine.engine_id,
+            "version": handle.version,
+            "swap_seconds": swap_seconds,
+            "drain_seconds": drain_seconds,
+            "forced": forced,
+            "ts": time.time(),
+        })
+
+    @contextlib.asynccontextmanager
+    async def lease(
+        self,
+        engine_id: Optional[str],
+    ) -> AsyncIterator[Optional[BaseAIEngine]]:
+        """
+        Hold the current instance of an engine for the duration of a call.
+        Yields None when the engine is not registered.
+        """
+        handle = self._handles.get(engine_id) if engine_id else None
+        if handle is None:
+            yield None
+            return
+
+        handle.refs += 1
+        try:
+            yield handle.engine
+        finally:
+            handle.release()
 
     async def get(self, engine_id: str) -> BaseAIEngine | None:
-        async with self._lock:
-            return self._engines.get(engine_id)
+        return self._engines.get(engine_id)
 
-    async def list(self) -> Dict[str, BaseAIEngine]:
-        async with self._lock:
-            return dict(self._engines)
+    async def list(self) -> Mapping[str, BaseAIEngine]:
+        """
+        Read-only snapshot of the registered engines (not copied).
+        """
+        return self._engines
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "engines": {
+                engine_id: handle.snapshot()
+                for engine_id, handle in self._handles.items()
+            },
+            "draining": [
+                {"engine_id": h.engine.engine_id, **h.snapshot()}
+                for h in self._retired
+            ],
+            "swaps": list(self.swaps),
+        }
 
 
 # Global singleton
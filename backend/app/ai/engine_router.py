@@ -1,20 +1,133 @@
-from typing import Dict, Any, Optional
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Dict, Any, Optional
 
 from .engine_registry import ENGINE_REGISTRY
+from .health_prober import HEALTH_PROBER
+from .circuit_breaker import CircuitBreaker
+from .hedging import HedgePolicy
+from .single_flight import SingleFlight, flight_key
+from .response_cache import RESPONSE_CACHE
+from .semantic_cache import SEMANTIC_CACHE
+from .scheduler import GenerationScheduler
+from .adaptive import AdaptiveSelector, ADAPTIVE, FIXED
+from .engines.errors import EngineUnavailable, RateLimited
 from app.core.event_bus import EVENT_BUS
 from app.core.state_manager import STATE
 from app.monitoring.logs import log
 
 
+class HedgeExhausted(RuntimeError):
+    """
+    Raised when both the primary and the hedged fallback failed,
+    so the normal fallback path must not retry.
+    """
+
+
+async def _anext(tokens: AsyncIterator[str]) -> str:
+    return await tokens.__anext__()
+
+
 class EngineRouter:
     """
     Routes generation requests to the active AI engine
-    with health checks and fallback support.
+    with cached health state, circuit breaking and fallback support.
+
+    - "fixed" mode: the active engine, then the fallback
+    - "adaptive" mode: each request goes to the best-scoring registered
+      engine (see AdaptiveSelector); fallback is the next best
     """
 
     def __init__(self):
         self._active_engine_id: Optional[str] = None
         self._fallback_engine_id: Optional[str] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.hedging = HedgePolicy()
+        self.single_flight = SingleFlight()
+        self.scheduler = GenerationScheduler()
+        self.selector = AdaptiveSelector()
+
+    @property
+    def active_engine_id(self) -> Optional[str]:
+        return self._active_engine_id
+
+    @property
+    def mode(self) -> str:
+        return self.selector.mode
+
+    def breaker(self, engine_id: str) -> CircuitBreaker:
+        if engine_id not in self._breakers:
+            self._breakers[engine_id] = CircuitBreaker(engine_id)
+        return self._breakers[engine_id]
+
+    def breakers(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            engine_id: breaker.snapshot()
+            for engine_id, breaker in self._breakers.items()
+        }
+
+    def _available(self, engine_id: str) -> bool:
+        return (
+            HEALTH_PROBER.is_healthy(engine_id)
+            and not self.breaker(engine_id).rejecting
+        )
+
+    async def _route(self, guild_id: Optional[str], kind: str) -> Optional[str]:
+        """
+        Engine for one request: the active engine in fixed mode,
+        otherwise a pin or the best-scoring available engine.
+        """
+        if not self.selector.adaptive:
+            return self._active_engine_id
+
+        engines = await ENGINE_REGISTRY.list()
+
+        pinned = self.selector.pinned(guild_id)
+        if pinned in engines:
+            return pinned
+
+        candidates = [
+            engine_id
+            for engine_id in self.selector.candidates(list(engines))
+            if self._available(engine_id)
+        ]
+        choice = self.selector.choose(
+            candidates,
+            kind,
+            {e: self.scheduler.load(e) for e in candidates},
+        )
+        return choice or self._active_engine_id
+
+    async def _alternate(self, engine_id: Optional[str], kind: str):
+        """
+        Engine to fall back (or hedge) to when `engine_id` is the primary.
+        """
+        if not self.selector.adaptive:
+            if self._fallback_engine_id == engine_id:
+                return None
+            return self._fallback_engine_id
+
+        engines = await ENGINE_REGISTRY.list()
+        candidates = [
+            e for e in self.selector.candidates(list(engines))
+            if e != engine_id and self._available(e)
+        ]
+        return self.selector.choose(
+            candidates,
+            kind,
+            {e: self.scheduler.load(e) for e in candidates},
+        ) or (
+            self._fallback_engine_id
+            if self._fallback_engine_id != engine_id else None
+        )
+
+    async def _admit(self, engine, role: str = "Primary") -> None:
+        if not HEALTH_PROBER.is_healthy(engine.engine_id):
+            raise EngineUnavailable(f"{role} engine unhealthy")
+
+        if not await self.breaker(engine.engine_id).allow():
+            raise EngineUnavailable(f"{role} engine circuit open")
 
     async def set_active(self, engine_id: str) -> None:
         """
@@ -26,9 +139,42 @@ class EngineRouter:
             raise ValueError(f"Engine '{engine_id}' is not registered")
 
         self._active_engine_id = engine_id
+        RESPONSE_CACHE.invalidate()
+        SEMANTIC_CACHE.invalidate()
 
         await log(f"Active AI engine set to: {engine_id}")
-        await EVENT_BUS.emit("engine.switched", engine_id=engine_id)
+        await EVENT_BUS.emit(
+            "engine.switched",
+            engine_id=engine_id,
+            mode=self.mode,
+        )
+
+    async def set_mode(self, mode: str) -> None:
+        """
+        Switch between fixed (active + fallback) and adaptive routing.
+        """
+        if mode not in (FIXED, ADAPTIVE):
+            raise ValueError(f"Unknown routing mode '{mode}'")
+
+        self.selector.mode = mode
+        await log(f"Engine routing mode set to: {mode}")
+        await EVENT_BUS.emit(
+            "engine.switched",
+            engine_id=self._active_engine_id,
+            mode=mode,
+        )
+
+    def pin(self, engine_id: Optional[str], guild_id: Optional[str] = None):
+        """
+        Pin a guild (or, without a guild, all traffic) to one engine
+        in adaptive mode. A None engine removes the pin.
+        """
+        if guild_id is None:
+            self.selector.global_pin = engine_id
+        elif engine_id is None:
+            self.selector.pins.pop(guild_id, None)
+        else:
+            self.selector.pins[guild_id] = engine_id
 
     async def set_fallback(self, engine_id: str) -> None:
         """
@@ -46,57 +192,645 @@ class EngineRouter:
         else:
             await log(f"Fallback AI engine set to: {engine_id}")
 
-    async def generate(
+    @contextlib.asynccontextmanager
+    async def _lease(
+        self,
+        engine_id: Optional[str],
+        role: str = "Active",
+    ) -> AsyncIterator[Any]:
+        """
+        Hold a registry lease on an engine for one call, so a hot-swap
+        drains it instead of shutting it down mid-request.
+        """
+        if not engine_id:
+            raise RuntimeError(f"No {role.lower()} AI engine set")
+
+        async with ENGINE_REGISTRY.lease(engine_id) as engine:
+            if not engine:
+                raise RuntimeError(
+                    f"{role} AI engine '{engine_id}' not found"
+                )
+            yield engine
+
+    async def _leased_generate(
         self,
+        engine_id: str,
         prompt: str,
         context: Dict[str, Any],
     ) -> str:
         """
-        Generate a response using the active engine,
-        falling back if needed.
+        Fallback / hedge call: admitted and tracked like the primary,
+        so the engine's breaker, health and routing scores see it.
         """
-        if not self._active_engine_id:
-            raise RuntimeError("No active AI engine set")
+        async with self._lease(engine_id, "Fallback") as engine:
+            await self._admit(engine, "Fallback")
+            return await self._tracked_generate(engine, prompt, context)
+
+    async def _leased_stream(
+        self,
+        engine_id: str,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        async with self._lease(engine_id, "Fallback") as engine:
+            await self._admit(engine, "Fallback")
+            async for token in self._tracked_stream(engine, prompt, context):
+                yield token
 
-        engine = await ENGINE_REGISTRY.get(self._active_engine_id)
-        if not engine:
-            raise RuntimeError(
-                f"Active AI engine '{self._active_engine_id}' not found"
+    async def _fallback(
+        self,
+        engine_id: Optional[str],
+        error: Exception,
+        kind: str,
+    ) -> str:
+        """
+        Resolve the fallback engine id after a primary failure.
+        Re-raises the original error when no fallback is configured.
+        """
+        await log(
+            f"AI generation error in engine "
+            f"{engine_id}: {str(error)}"
+        )
+
+        # A failed real request marks the engine down without waiting
+        # for the next probe cycle
+        if (
+            not isinstance(error, EngineUnavailable)
+            and HEALTH_PROBER.is_healthy(engine_id)
+        ):
+            await HEALTH_PROBER.mark_unhealthy(
+                engine_id,
+                str(error),
             )
 
+        fallback_id = await self._alternate(engine_id, kind)
+        if not fallback_id:
+            raise error
+
+        await log(
+            f"Engine fallback triggered: "
+            f"{engine_id} → {fallback_id}"
+        )
+
+        await STATE.set(
+            "ai",
+            "last_fallback",
+            fallback_id,
+        )
+
+        return fallback_id
+
+    async def _hedge_target(
+        self,
+        engine_id: Optional[str],
+        kind: str,
+    ) -> Optional[str]:
+        """
+        Fallback engine id to race against the primary, if hedging applies.
+        """
+        if not self.hedging.enabled:
+            return None
+
+        target = await self._alternate(engine_id, kind)
+        if not target or not HEALTH_PROBER.is_healthy(target):
+            return None
+        return target
+
+    async def _tracked_generate(
+        self,
+        engine,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> str:
+        """
+        Call an engine, feeding its breaker and latency samples.
+        """
+        breaker = self.breaker(engine.engine_id)
+        start = time.perf_counter()
+
         try:
-            if not await engine.health_check():
-                raise RuntimeError("Primary engine unhealthy")
+            response = await engine.generate(prompt, context)
+        except (asyncio.CancelledError, EngineUnavailable):
+            # Not called, or throttled: says nothing about engine health
+            breaker.release()
+            raise
+        except Exception:
+            latency = time.perf_counter() - start
+            await breaker.record_failure(latency)
+            self.selector.observe(engine.engine_id, latency, "generate", ok=False)
+            raise
 
-            return await engine.generate(prompt, context)
+        latency = time.perf_counter() - start
+        await breaker.record_success(latency)
+        self.hedging.observe(engine.engine_id, latency, "generate")
+        self.selector.observe(engine.engine_id, latency, "generate")
+        await HEALTH_PROBER.mark_healthy(engine.engine_id)
+        return response
 
-        except Exception as e:
+    async def _tracked_stream(
+        self,
+        engine,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Stream from an engine, feeding its breaker and latency samples.
+        Breaker latency for streams is time-to-first-token.
+        """
+        breaker = self.breaker(engine.engine_id)
+        start = time.perf_counter()
+        started = False
+
+        try:
+            async for token in engine.stream(prompt, context):
+                if not started:
+                    started = True
+                    latency = time.perf_counter() - start
+                    await breaker.record_success(latency)
+                    self.hedging.observe(
+                        engine.engine_id,
+                        latency,
+                        "first_token",
+                    )
+                    self.selector.observe(
+                        engine.engine_id,
+                        latency,
+                        "first_token",
+                    )
+                yield token
+        except (asyncio.CancelledError, GeneratorExit, EngineUnavailable):
+            if not started:
+                breaker.release()
+            raise
+        except Exception:
+            if not started:
+                latency = time.perf_counter() - start
+                await breaker.record_failure(latency)
+                self.selector.observe(
+                    engine.engine_id,
+                    latency,
+                    "first_token",
+                    ok=False,
+                )
+            raise
+
+        if not started:
+            await breaker.record_success(time.perf_counter() - start)
+
+        await HEALTH_PROBER.mark_healthy(engine.engine_id)
+
+    async def _hedged_generate(
+        self,
+        engine,
+        hedge_id: str,
+        prompt: str,
+        context: Dict[str, Any],
+        served: Dict[str, Any],
+    ) -> str:
+        """
+        Race the fallback against a slow primary and keep the winner.
+        """
+        delay = self.hedging.delay(engine.engine_id, "generate")
+        start = time.perf_counter()
+        primary = asyncio.create_task(
+            self._tracked_generate(engine, prompt, context)
+        )
+        pending = {primary}
+        errors = []
+
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                response = primary.result()
+                served["engine_id"] = engine.engine_id
+                return response
+
+            self.hedging.record("fired")
             await log(
-                f"AI generation error in engine "
-                f"{self._active_engine_id}: {str(e)}"
+                f"Hedging {engine.engine_id} → {hedge_id} "
+                f"after {delay:.2f}s"
             )
 
-            if not self._fallback_engine_id:
-                raise
+            hedge = asyncio.create_task(
+                self._leased_generate(hedge_id, prompt, context)
+            )
+            pending.add(hedge)
 
-            fallback = await ENGINE_REGISTRY.get(self._fallback_engine_id)
-            if not fallback:
-                raise RuntimeError(
-                    f"Fallback engine '{self._fallback_engine_id}' not registered"
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
+                for task in done:
+                    if task.exception() is None:
+                        self.hedging.record(
+                            "hedge_won" if task is hedge else "primary_won"
+                        )
+                        served["engine_id"] = (
+                            hedge_id if task is hedge else engine.engine_id
+                        )
+                        return task.result()
+                    errors.append(task.exception())
 
-            await log(
-                f"Engine fallback triggered: "
-                f"{self._active_engine_id} → {self._fallback_engine_id}"
+        finally:
+            if not primary.done():
+                # Censored sample: the primary took at least this long
+                self.hedging.observe(
+                    engine.engine_id,
+                    time.perf_counter() - start,
+                    "generate",
+                )
+            for task in pending:
+                task.cancel()
+
+        self.hedging.record("both_failed")
+        raise HedgeExhausted(f"Primary and hedge both failed: {errors}")
+
+    async def _hedged_stream(
+        self,
+        engine,
+        hedge_id: str,
+        prompt: str,
+        context: Dict[str, Any],
+        served: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Race the fallback's first token against a slow primary,
+        then continue streaming from whichever produced first.
+        """
+        delay = self.hedging.delay(engine.engine_id, "first_token")
+        start = time.perf_counter()
+        primary = self._tracked_stream(engine, prompt, context)
+        hedge = None
+
+        tasks = {asyncio.create_task(_anext(primary)): primary}
+        winner, first, errors = None, None, []
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedging.record("fired")
+                await log(
+                    f"Hedging {engine.engine_id} → {hedge_id} "
+                    f"after {delay:.2f}s without a token"
+                )
+                hedge = self._leased_stream(hedge_id, prompt, context)
+                tasks[asyncio.create_task(_anext(hedge))] = hedge
+
+            while tasks and winner is None:
+                done, _ = await asyncio.wait(
+                    tasks,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    source = tasks.pop(task)
+                    error = task.exception()
+
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        winner = source
+                        first = task.result() if error is None else None
+                        break
+
+                    # Primary failed before the hedge fired: normal fallback
+                    if hedge is None:
+                        raise error
+                    errors.append(error)
+
+        finally:
+            for task, source in tasks.items():
+                if task.done():
+                    # Loser already yielded; close it so it releases its slot
+                    with contextlib.suppress(Exception):
+                        await source.aclose()
+                else:
+                    if source is primary:
+                        # Censored sample: no first token after this long
+                        self.hedging.observe(
+                            engine.engine_id,
+                            time.perf_counter() - start,
+                            "first_token",
+                        )
+                    task.cancel()
+
+        if winner is None:
+            self.hedging.record("both_failed")
+            raise HedgeExhausted(f"Primary and hedge both failed: {errors}")
+
+        if hedge is not None:
+            self.hedging.record(
+                "hedge_won" if winner is hedge else "primary_won"
             )
+        served["engine_id"] = hedge_id if winner is hedge else engine.engine_id
+
+        if first is None:
+            return
+
+        yield first
+        async for token in winner:
+            yield token
+
+    async def _cache_key(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str],
+    ) -> Optional[str]:
+        if not engine_id or not RESPONSE_CACHE.applies(guild_id):
+            return None
+
+        engine = await ENGINE_REGISTRY.get(engine_id)
+        # Tiered engines may answer with a smaller model than .model
+        model_for = getattr(engine, "model_for", None)
+        model = (
+            model_for(prompt, context) if model_for
+            else getattr(engine, "model", "")
+        )
+        return RESPONSE_CACHE.key(
+            engine_id,
+            str(model),
+            prompt,
+            context,
+        )
+
+    async def _semantic_lookup(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str],
+        user_id: Optional[str],
+    ):
+        """
+        Returns (partition key, query vector, cached response or None).
+        """
+        if (
+            not SEMANTIC_CACHE.enabled
+            or not engine_id
+            or not RESPONSE_CACHE.applies(guild_id)
+        ):
+            return None, None, None
+
+        key = SEMANTIC_CACHE.partition_key(
+            guild_id, user_id, engine_id, context
+        )
+        if key is None:
+            return None, None, None
+
+        vector, similar = await SEMANTIC_CACHE.lookup(key, prompt)
+        return key, vector, similar
+
+    async def generate(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        priority: bool = False,
+    ) -> str:
+        """
+        Generate a response using the active engine.
+        Exact repeats and close paraphrases are served from cache;
+        concurrent identical requests share one generation, which is
+        admitted through the scheduler (may raise SchedulerFull).
+        """
+        engine_id = await self._route(guild_id, "generate")
+
+        cache_key = await self._cache_key(engine_id, prompt, context, guild_id)
+        if cache_key:
+            cached = RESPONSE_CACHE.get(engine_id, cache_key)
+            if cached is not None:
+                return cached
+
+        semantic_key, vector, similar = await self._semantic_lookup(
+            engine_id, prompt, context, guild_id, user_id
+        )
+        if similar is not None:
+            return similar
+
+        # Filled with the engine that answered; only this request's own
+        # generation fills it (a single-flight follower's stays empty)
+        served: Dict[str, Any] = {}
+        start = time.perf_counter()
+        if self.single_flight.enabled:
+            response = await self.single_flight.do(
+                flight_key(str(engine_id), prompt, context),
+                lambda: self._scheduled_generate(
+                    engine_id, prompt, context, guild_id, user_id, priority,
+                    served,
+                ),
+            )
+        else:
+            response = await self._scheduled_generate(
+                engine_id, prompt, context, guild_id, user_id, priority,
+                served,
+            )
+
+        # Fallback / hedge replies are not the routed engine's to cache
+        if served.get("engine_id") != engine_id:
+            return response
+
+        if cache_key:
+            RESPONSE_CACHE.put(engine_id, cache_key, response)
+        SEMANTIC_CACHE.store(
+            semantic_key,
+            vector,
+            response,
+            time.perf_counter() - start,
+        )
+        return response
 
-            await STATE.set(
-                "ai",
-                "last_fallback",
-                self._fallback_engine_id,
+    async def _scheduled_generate(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str],
+        user_id: Optional[str],
+        priority: bool,
+        served: Dict[str, Any],
+    ) -> str:
+        async with self.scheduler.slot(
+            str(engine_id),
+            guild_id=guild_id,
+            user_id=user_id,
+            priority=priority,
+        ):
+            return await self._generate(engine_id, prompt, context, served)
+
+    async def _generate(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        served: Dict[str, Any],
+    ) -> str:
+        """
+        Generate a response using the active engine,
+        optionally hedging against the fallback, falling back if needed.
+        served["engine_id"] is set to the engine that answered.
+        """
+        async with self._lease(engine_id) as engine:
+            try:
+                await self._admit(engine)
+
+                hedge_id = await self._hedge_target(engine_id, "generate")
+                if hedge_id:
+                    return await self._hedged_generate(
+                        engine,
+                        hedge_id,
+                        prompt,
+                        context,
+                        served,
+                    )
+
+                response = await self._tracked_generate(engine, prompt, context)
+                served["engine_id"] = engine_id
+                return response
+
+            except HedgeExhausted:
+                raise
+
+            except Exception as e:
+                fallback_id = await self._fallback(engine_id, e, "generate")
+
+        response = await self._leased_generate(fallback_id, prompt, context)
+        served["engine_id"] = fallback_id
+        return response
+
+    async def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        priority: bool = False,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the active engine.
+        Cached replies are yielded whole; concurrent identical
+        requests share one stream, admitted through the scheduler.
+        """
+        engine_id = await self._route(guild_id, "first_token")
+
+        cache_key = await self._cache_key(engine_id, prompt, context, guild_id)
+        if cache_key:
+            cached = RESPONSE_CACHE.get(engine_id, cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        semantic_key, vector, similar = await self._semantic_lookup(
+            engine_id, prompt, context, guild_id, user_id
+        )
+        if similar is not None:
+            yield similar
+            return
+
+        served: Dict[str, Any] = {}
+        start = time.perf_counter()
+        if self.single_flight.enabled:
+            tokens = self.single_flight.stream(
+                flight_key(str(engine_id), prompt, context),
+                lambda: self._scheduled_stream(
+                    engine_id, prompt, context, guild_id, user_id, priority,
+                    served,
+                ),
             )
+        else:
+            tokens = self._scheduled_stream(
+                engine_id, prompt, context, guild_id, user_id, priority,
+                served,
+            )
+
+        parts = []
+        async for token in tokens:
+            parts.append(token)
+            yield token
+
+        # Fallback / hedge replies are not the routed engine's to cache
+        if served.get("engine_id") != engine_id:
+            return
+
+        response = "".join(parts)
+        if cache_key:
+            RESPONSE_CACHE.put(engine_id, cache_key, response)
+        SEMANTIC_CACHE.store(
+            semantic_key,
+            vector,
+            response,
+            time.perf_counter() - start,
+        )
+
+    async def _scheduled_stream(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        guild_id: Optional[str],
+        user_id: Optional[str],
+        priority: bool,
+        served: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        async with self.scheduler.slot(
+            str(engine_id),
+            guild_id=guild_id,
+            user_id=user_id,
+            priority=priority,
+        ):
+            async for token in self._stream(
+                engine_id, prompt, context, served
+            ):
+                yield token
+
+    async def _stream(
+        self,
+        engine_id: Optional[str],
+        prompt: str,
+        context: Dict[str, Any],
+        served: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the active engine.
+        Falls back only if the primary fails before its first token,
+        since partial output has already reached the user.
+        served["engine_id"] is set to the engine that answered.
+        """
+        started = False
+
+        # The lease spans the whole stream, so a swap drains it first
+        async with self._lease(engine_id) as engine:
+            try:
+                await self._admit(engine)
+
+                hedge_id = await self._hedge_target(engine_id, "first_token")
+                if hedge_id:
+                    tokens = self._hedged_stream(
+                        engine,
+                        hedge_id,
+                        prompt,
+                        context,
+                        served,
+                    )
+                else:
+                    served["engine_id"] = engine_id
+                    tokens = self._tracked_stream(engine, prompt, context)
+
+                async for token in tokens:
+                    started = True
+                    yield token
+                return
+
+            except Exception as e:
+                if started or isinstance(e, HedgeExhausted):
+                    raise
+                fallback_id = await self._fallback(
+                    engine_id, e, "first_token"
+                )
 
-            return await fallback.generate(prompt, context)
+        served["engine_id"] = fallback_id
+        async for token in self._leased_stream(fallback_id, prompt, context):
+            yield token
 
 
 # Global singleton
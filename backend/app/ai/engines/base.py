@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 
 
 class BaseAIEngine(ABC):
@@ -22,6 +22,17 @@ class BaseAIEngine(ABC):
         """
         raise NotImplementedError
 
+    async def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text fragments.
+        Engines without native streaming yield the full reply once.
+        """
+        yield await self.generate(prompt, context)
+
     @abstractmethod
     async def health_check(self) -> bool:
         """
@@ -36,6 +47,12 @@ class BaseAIEngine(ABC):
         """
         raise NotImplementedError
 
+    async def start(self) -> None:
+        """
+        Optional startup hook, called on registration.
+        """
+        return
+
     async def shutdown(self) -> None:
         """
         Optional cleanup hook for hot-swap.
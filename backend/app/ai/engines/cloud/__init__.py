@@ -8,13 +8,50 @@ Supported:
 All other cloud modules in this directory are deprecated.
 """
 
+from app.ai.engine_registry import ENGINE_REGISTRY
+from app.core.config import Config
 from app.monitoring.logs import log_sync
 
 from .openai_engine import OpenAIEngine
 from .gemini_engine import GeminiEngine
+from .rate_limit import RateLimited, provider_limiter
 
 
-def register_cloud_engines():
+CLOUD_ENGINES = {
+    "openai": (OpenAIEngine, "OPENAI_API_KEY"),
+    "gemini": (GeminiEngine, "GEMINI_API_KEY"),
+}
+
+
+async def register_cloud_engine(engine_id: str) -> bool:
+    """
+    (Re)register one cloud engine from the current .env.
+
+    - Skipped (False) when its API key is not set
+    - Provider rate limits ({PROVIDER}_RPM / _TPM, CLOUD_*) are
+      (re)applied on every call
+    - A running instance is hot-swapped: it drains in the background
+    """
+    if engine_id not in CLOUD_ENGINES:
+        raise ValueError(f"Unknown cloud engine '{engine_id}'")
+
+    engine_cls, key_name = CLOUD_ENGINES[engine_id]
+    provider_limiter(engine_id).configure_from_env()
+
+    if not Config.get(key_name):
+        log_sync(f"[ai] {engine_id} skipped: {key_name} not set")
+        return False
+
+    try:
+        await ENGINE_REGISTRY.register(engine_cls())
+        log_sync(f"[ai] {engine_id} engine registered")
+        return True
+    except Exception as e:
+        log_sync(f"[ai][warn] {engine_id} engine failed to load: {e}")
+        return False
+
+
+async def register_cloud_engines():
     """
     Explicitly registers all cloud-based AI engines.
     This function is required by the engine bootstrap system.
@@ -22,16 +59,14 @@ def register_cloud_engines():
 
     log_sync("[ai] Registering cloud engines...")
 
-    # Importing is enough if engines self-register
-    _ = OpenAIEngine
-    log_sync("[ai] OpenAI engine loaded")
-
-    _ = GeminiEngine
-    log_sync("[ai] Gemini engine loaded")
+    for engine_id in CLOUD_ENGINES:
+        await register_cloud_engine(engine_id)
 
 
 __all__ = [
     "OpenAIEngine",
     "GeminiEngine",
+    "RateLimited",
+    "register_cloud_engine",
     "register_cloud_engines",
 ]
@@ -1,8 +1,12 @@
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
 import time
 
+from app.ai.context_manager import ContextManager, estimate_tokens
 from app.ai.engines.base import BaseAIEngine
+from app.ai.engines.metrics import EngineMetrics
 from app.core.config import Config
+from app.utils.async_tools import BLOCKING_EXECUTOR, run_blocking
+from .rate_limit import call_with_backoff, provider_limiter
 
 
 # --- SAFE IMPORT (legacy + future compatible) -------------------------------
@@ -16,6 +20,24 @@ except ImportError:
         genai = None
 
 
+_CLIENTS: Dict[str, Any] = {}
+
+
+def shared_client(api_key: str, model_name: str):
+    """
+    One persistent SDK handle per API key (and model, for the legacy SDK),
+    reused across engine re-registration.
+    """
+    key = f"{api_key}:{model_name}"
+    if key not in _CLIENTS:
+        if hasattr(genai, "configure"):
+            genai.configure(api_key=api_key)
+            _CLIENTS[key] = genai.GenerativeModel(model_name)
+        else:
+            _CLIENTS[key] = genai.Client(api_key=api_key)
+    return _CLIENTS[key]
+
+
 class GeminiEngine(BaseAIEngine):
     def __init__(self):
         super().__init__(engine_id="gemini")
@@ -29,56 +51,164 @@ class GeminiEngine(BaseAIEngine):
         if not api_key:
             raise RuntimeError("GEMINI_API_KEY is not configured")
 
-        # Legacy SDK configuration
-        if hasattr(genai, "configure"):
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel(
-                Config.get("GEMINI_MODEL", "gemini-1.5-flash")
-            )
+        self.model_name = Config.get("GEMINI_MODEL", "gemini-1.5-flash")
+        self.timeout = float(Config.get("GEMINI_TIMEOUT", 60))
+
+        # Legacy SDK exposes an async model; the new SDK is synchronous
+        # and every call goes through the blocking executor
+        self.legacy = hasattr(genai, "configure")
+        if self.legacy:
+            self.model = shared_client(api_key, self.model_name)
         else:
-            # Placeholder for new SDK path (future-proof)
-            self.client = genai.Client(api_key=api_key)
-            self.model = self.client.models.get(
-                Config.get("GEMINI_MODEL", "gemini-1.5-flash")
+            self.client = shared_client(api_key, self.model_name)
+
+        self.limiter = provider_limiter("gemini")
+        self.metrics_collector = EngineMetrics()
+
+    def _reserve(self, payload: str) -> int:
+        return estimate_tokens(payload) + self.limiter.completion_reserve
+
+    def _open_stream(self, payload: str):
+        """
+        Start a new-SDK stream and pull the first chunk, so request
+        errors (e.g. 429) surface here where they can be retried.
+        """
+        chunks = iter(
+            self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=payload,
             )
-
-        self._requests = 0
-        self._latency = 0.0
+        )
+        return next(chunks, None), chunks
+
+    def _record(self, start: float, response, reserved: int, ttft=None) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        self.limiter.settle(
+            reserved,
+            getattr(usage, "total_token_count", None),
+        )
+        self.metrics_collector.record(
+            self.model_name,
+            time.perf_counter() - start,
+            prompt_tokens=getattr(usage, "prompt_token_count", None),
+            completion_tokens=getattr(usage, "candidates_token_count", None),
+            ttft=ttft,
+        )
 
     async def generate(self, prompt: str, context: Dict[str, Any]) -> str:
         start = time.perf_counter()
 
         try:
-            payload = f"{context}\n\n{prompt}"
+            payload = (
+                f"{context.get('system', '')}\n\n"
+                f"{ContextManager.user_turn(prompt, context)}"
+            )
+            reserved = self._reserve(payload)
 
             # Legacy async API
-            if hasattr(self.model, "generate_content_async"):
-                response = await self.model.generate_content_async(payload)
-                text = response.text
+            if self.legacy:
+                response = await call_with_backoff(
+                    self.limiter,
+                    reserved,
+                    lambda: self.model.generate_content_async(payload),
+                )
             else:
-                # New SDK (sync for now, wrapped safely)
-                response = self.model.generate_content(payload)
-                text = response.text
+                response = await call_with_backoff(
+                    self.limiter,
+                    reserved,
+                    lambda: run_blocking(
+                        self.client.models.generate_content,
+                        model=self.model_name,
+                        contents=payload,
+                        timeout=self.timeout,
+                    ),
+                )
+            text = response.text
 
             self.healthy = True
-            return text
 
         except Exception:
             self.healthy = False
+            self.metrics_collector.record_error(
+                self.model_name, time.perf_counter() - start
+            )
             raise
 
-        finally:
-            self._requests += 1
-            self._latency += time.perf_counter() - start
+        self._record(start, response, reserved)
+        return text
+
+    async def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        ttft = None
+        response = None
+
+        try:
+            payload = (
+                f"{context.get('system', '')}\n\n"
+                f"{ContextManager.user_turn(prompt, context)}"
+            )
+            reserved = self._reserve(payload)
+
+            # Legacy async API supports native streaming
+            if self.legacy:
+                chunks = await call_with_backoff(
+                    self.limiter,
+                    reserved,
+                    lambda: self.model.generate_content_async(
+                        payload,
+                        stream=True,
+                    ),
+                )
+            else:
+                # New SDK streams through a blocking iterator
+                first, rest = await call_with_backoff(
+                    self.limiter,
+                    reserved,
+                    lambda: run_blocking(
+                        self._open_stream,
+                        payload,
+                        timeout=self.timeout,
+                    ),
+                )
+                chunks = self._chain(first, rest)
+
+            async for chunk in chunks:
+                response = chunk
+                if chunk.text:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    yield chunk.text
+
+            self.healthy = True
+
+        except Exception:
+            self.healthy = False
+            self.metrics_collector.record_error(
+                self.model_name, time.perf_counter() - start
+            )
+            raise
+
+        # Streamed responses expose cumulative usage once complete
+        self._record(start, response, reserved, ttft)
+
+    async def _chain(self, first, rest) -> AsyncIterator[Any]:
+        if first is None:
+            return
+        yield first
+        async for chunk in BLOCKING_EXECUTOR.iterate(rest, timeout=self.timeout):
+            yield chunk
 
     async def health_check(self) -> bool:
         return bool(Config.get("GEMINI_API_KEY")) and genai is not None
 
     def metrics(self) -> Dict[str, Any]:
-        avg = self._latency / self._requests if self._requests else 0.0
         return {
             "engine": "gemini",
-            "requests": self._requests,
-            "avg_latency": avg,
+            **self.metrics_collector.snapshot(),
+            "rate_limit": self.limiter.snapshot(),
             "healthy": self.healthy,
         }
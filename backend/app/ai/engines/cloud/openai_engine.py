@@ -1,46 +1,157 @@
 import time
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, Optional
+
+import httpx
 import openai
 
+from app.ai.context_manager import ContextManager, estimate_tokens
 from app.ai.engines.base import BaseAIEngine
+from app.ai.engines.metrics import EngineMetrics
 from app.core.config import Config
+from .rate_limit import call_with_backoff, provider_limiter
+
+
+_CLIENTS: Dict[str, "openai.AsyncOpenAI"] = {}
+
+
+def shared_client(api_key: Optional[str]) -> "openai.AsyncOpenAI":
+    """
+    One persistent AsyncOpenAI client (and connection pool) per API key.
+    Engine re-registration reuses it instead of reconnecting.
+    """
+    key = api_key or ""
+    if key not in _CLIENTS:
+        _CLIENTS[key] = openai.AsyncOpenAI(
+            api_key=api_key,
+            # Retries are ours (rate_limit.call_with_backoff)
+            max_retries=0,
+            timeout=float(Config.get("OPENAI_TIMEOUT", 60)),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(
+                        Config.get("OPENAI_MAX_CONNECTIONS", 20)
+                    ),
+                    max_keepalive_connections=int(
+                        Config.get("OPENAI_MAX_KEEPALIVE", 10)
+                    ),
+                ),
+            ),
+        )
+    return _CLIENTS[key]
 
 
 class OpenAIEngine(BaseAIEngine):
     def __init__(self):
         super().__init__(engine_id="openai")
-        openai.api_key = Config.get("OPENAI_API_KEY")
+        self.client = shared_client(Config.get("OPENAI_API_KEY"))
         self.model = Config.get("OPENAI_MODEL", "gpt-4o-mini")
-        self._requests = 0
-        self._latency = 0.0
+        self.limiter = provider_limiter("openai")
+        self.metrics_collector = EngineMetrics()
+
+    def _messages(self, prompt: str, context: Dict[str, Any]):
+        return [
+            {"role": "system", "content": context.get("system", "")},
+            {
+                "role": "user",
+                "content": ContextManager.user_turn(prompt, context),
+            },
+        ]
+
+    def _reserve(self, prompt: str, context: Dict[str, Any]) -> int:
+        return (
+            estimate_tokens(context.get("system", ""))
+            + estimate_tokens(ContextManager.user_turn(prompt, context))
+            + self.limiter.completion_reserve
+        )
 
     async def generate(self, prompt: str, context: Dict[str, Any]) -> str:
         start = time.perf_counter()
+        reserved = self._reserve(prompt, context)
         try:
-            response = await openai.ChatCompletion.acreate(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": str(context)},
-                    {"role": "user", "content": prompt},
-                ],
+            response = await call_with_backoff(
+                self.limiter,
+                reserved,
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(prompt, context),
+                ),
             )
             self.healthy = True
-            return response.choices[0].message.content
         except Exception:
             self.healthy = False
+            self.metrics_collector.record_error(
+                self.model, time.perf_counter() - start
+            )
             raise
-        finally:
-            self._requests += 1
-            self._latency += time.perf_counter() - start
+
+        usage = getattr(response, "usage", None)
+        self.limiter.settle(reserved, getattr(usage, "total_tokens", None))
+        self.metrics_collector.record(
+            self.model,
+            time.perf_counter() - start,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            completion_tokens=getattr(usage, "completion_tokens", None),
+        )
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+        reserved = self._reserve(prompt, context)
+        ttft = None
+        chunks = 0
+        usage = None
+        try:
+            response = await call_with_backoff(
+                self.limiter,
+                reserved,
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=self._messages(prompt, context),
+                    stream=True,
+                    # Final chunk carries real token usage
+                    stream_options={"include_usage": True},
+                ),
+            )
+            async for chunk in response:
+                if chunk.usage:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                    chunks += 1
+                    yield token
+            self.healthy = True
+        except Exception:
+            self.healthy = False
+            self.metrics_collector.record_error(
+                self.model, time.perf_counter() - start
+            )
+            raise
+
+        self.limiter.settle(reserved, getattr(usage, "total_tokens", None))
+        self.metrics_collector.record(
+            self.model,
+            time.perf_counter() - start,
+            prompt_tokens=getattr(usage, "prompt_tokens", None),
+            # Without usage, streamed deltas carry roughly one token each
+            completion_tokens=getattr(usage, "completion_tokens", chunks),
+            ttft=ttft,
+        )
 
     async def health_check(self) -> bool:
         return bool(Config.get("OPENAI_API_KEY"))
 
     def metrics(self) -> Dict[str, Any]:
-        avg = self._latency / self._requests if self._requests else 0.0
         return {
             "engine": "openai",
-            "requests": self._requests,
-            "avg_latency": avg,
+            **self.metrics_collector.snapshot(),
+            "rate_limit": self.limiter.snapshot(),
             "healthy": self.healthy,
         }
@@ -0,0 +1,259 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import Config
+from app.ai.engines.errors import RateLimited
+
+
+# Worth retrying: throttled or a transient provider-side failure
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at `per_minute`.
+    A rate <= 0 means unlimited.
+    """
+
+    def __init__(self, per_minute: float):
+        self.per_minute = 0.0
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+        self.configure(per_minute)
+
+    def configure(self, per_minute: float) -> None:
+        was_unlimited = self.unlimited
+        self.per_minute = float(per_minute)
+        self.capacity = max(self.per_minute, 1.0)
+        self.rate = self.per_minute / 60.0
+        # A newly applied limit starts full; a changed one keeps its level
+        self.tokens = (
+            self.capacity if was_unlimited
+            else min(self.tokens, self.capacity)
+        )
+
+    @property
+    def unlimited(self) -> bool:
+        return self.per_minute <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated) * self.rate,
+        )
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens -= amount
+
+
+class ProviderLimiter:
+    """
+    Client-side limits for one cloud provider.
+
+    - Requests/min and tokens/min token buckets ({PROVIDER}_RPM / _TPM)
+    - Token reservations are settled against real usage afterwards
+    - A 429 pauses every caller until the provider's Retry-After
+    - Callers wait their turn (FIFO); a wait longer than
+      CLOUD_MAX_QUEUE_WAIT fails fast with RateLimited
+    """
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.requests = TokenBucket(0)
+        self.tokens = TokenBucket(0)
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.throttled = 0
+        self.rejected = 0
+        self.retries = 0
+        self.remote_limited = 0
+        self.waited = 0.0
+
+        self.configure_from_env()
+
+    def configure_from_env(self) -> None:
+        prefix = self.provider.upper()
+        self.requests.configure(float(Config.get(f"{prefix}_RPM", 0)))
+        self.tokens.configure(float(Config.get(f"{prefix}_TPM", 0)))
+        self.completion_reserve = int(
+            Config.get(f"{prefix}_COMPLETION_RESERVE", 256)
+        )
+        self.max_wait = float(Config.get("CLOUD_MAX_QUEUE_WAIT", 10))
+        self.max_retries = int(Config.get("CLOUD_MAX_RETRIES", 2))
+        self.backoff_base = float(Config.get("CLOUD_BACKOFF_BASE", 0.5))
+        self.backoff_max = float(Config.get("CLOUD_BACKOFF_MAX", 8))
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self.paused_until - time.monotonic(),
+            self.requests.wait_time(1),
+            self.tokens.wait_time(tokens),
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        try:
+            await asyncio.wait_for(self._lock.acquire(), self.max_wait)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise RateLimited(f"{self.provider} rate limit: queue too long")
+
+        try:
+            while True:
+                wait = self._wait_time(tokens)
+                if wait <= 0:
+                    break
+                if wait > self.max_wait:
+                    self.rejected += 1
+                    raise RateLimited(
+                        f"{self.provider} rate limit: next slot in {wait:.1f}s"
+                    )
+                self.throttled += 1
+                self.waited += wait
+                await asyncio.sleep(wait)
+
+            self.requests.take(1)
+            self.tokens.take(tokens)
+        finally:
+            self._lock.release()
+
+    def settle(self, reserved: int, used: Optional[int]) -> None:
+        """
+        Correct a reservation once the provider reports real usage.
+        """
+        if used is not None:
+            self.tokens.take(used - reserved)
+
+    def pause(self, seconds: float) -> None:
+        self.paused_until = max(
+            self.paused_until,
+            time.monotonic() + seconds,
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter.
+        """
+        return random.uniform(
+            0,
+            min(self.backoff_max, self.backoff_base * 2 ** attempt),
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.requests.per_minute,
+            "tpm": self.tokens.per_minute,
+            "paused_for": max(0.0, self.paused_until - time.monotonic()),
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+            "retries": self.retries,
+            "remote_limited": self.remote_limited,
+            "seconds_waited": self.waited,
+        }
+
+
+def _status(error: Exception) -> Optional[int]:
+    for attr in ("status_code", "code", "http_status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return int(value)
+
+    value = getattr(getattr(error, "response", None), "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None) or getattr(
+        getattr(error, "response", None), "headers", None
+    )
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+
+        value = headers.get("retry-after")
+        if not value:
+            return None
+        if value.strip().isdigit():
+            return float(value)
+        # HTTP-date form
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def call_with_backoff(
+    limiter: ProviderLimiter,
+    tokens: int,
+    fn: Callable[[], Awaitable[Any]],
+) -> Any:
+    """
+    Run `fn` under the provider's limits, retrying throttled and
+    transient failures. Retry-After is honoured; otherwise backoff
+    is exponential with jitter.
+    """
+    attempt = 0
+    while True:
+        await limiter.acquire(tokens)
+
+        try:
+            return await fn()
+        except Exception as e:
+            status = _status(e)
+            if status not in RETRYABLE_STATUS:
+                raise
+
+            retry_after = _retry_after(e)
+            delay = (
+                retry_after + random.uniform(0, limiter.backoff_base)
+                if retry_after is not None
+                else limiter.backoff(attempt)
+            )
+
+            if status == 429:
+                limiter.remote_limited += 1
+                # Hold back every caller, not just this one
+                limiter.pause(delay)
+
+            # Waiting longer than a fallback would take helps nobody
+            if attempt >= limiter.max_retries or delay > limiter.backoff_max:
+                if status == 429:
+                    raise RateLimited(
+                        f"{limiter.provider} throttled (429), "
+                        f"retry after {delay:.1f}s"
+                    ) from e
+                raise
+
+            limiter.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+
+_LIMITERS: Dict[str, ProviderLimiter] = {}
+
+
+def provider_limiter(provider: str) -> ProviderLimiter:
+    """
+    The shared limiter for a provider, created on first use.
+    """
+    if provider not in _LIMITERS:
+        _LIMITERS[provider] = ProviderLimiter(provider)
+    return _LIMITERS[provider]
@@ -0,0 +1,12 @@
+class EngineUnavailable(RuntimeError):
+    """
+    Raised when an engine is skipped without being called
+    (cached unhealthy or circuit open).
+    """
+
+
+class RateLimited(EngineUnavailable):
+    """
+    Raised when a provider's rate limit (local or remote) prevents a call.
+    Not an engine fault: it must not trip breakers or health state.
+    """
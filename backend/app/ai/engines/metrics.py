@@ -0,0 +1,163 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Upper bounds (seconds); the last bucket catches everything slower
+LATENCY_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0,
+    8.0, 13.0, 20.0, 30.0, 60.0, 120.0, float("inf"),
+)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram with percentile estimates.
+    O(1) record, constant memory, no sample retention.
+    """
+
+    def __init__(self):
+        self.counts: List[int] = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate by linear interpolation inside the matching bucket.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if seen + n >= rank and n:
+                lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+                upper = LATENCY_BUCKETS[i]
+                if upper == float("inf"):
+                    return max(lower, self.max)
+                estimate = lower + (upper - lower) * (rank - seen) / n
+                return min(estimate, self.max)
+            seen += n
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class _ModelStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency = LatencyHistogram()
+        self.ttft = LatencyHistogram()
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.eval_seconds = 0.0
+        self.prompt_eval_seconds = 0.0
+        self.load_seconds = 0.0
+        self.generation_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        # Prefer the engine's own eval time; fall back to wall time
+        decode_seconds = self.eval_seconds or self.generation_seconds
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency": self.latency.snapshot(),
+            "time_to_first_token": self.ttft.snapshot(),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_second": (
+                self.completion_tokens / decode_seconds
+                if decode_seconds else 0.0
+            ),
+            "prompt_eval_seconds": self.prompt_eval_seconds,
+            "load_seconds": self.load_seconds,
+        }
+
+
+class EngineMetrics:
+    """
+    Shared per-engine metrics, broken down by model.
+
+    - Latency and time-to-first-token histograms (p50/p95/p99)
+    - Prompt/completion token counts and tokens/sec
+    - Engine-reported eval, prompt-eval and load durations
+    """
+
+    def __init__(self):
+        self._models: Dict[str, _ModelStats] = {}
+        self.last_request_ts: Optional[float] = None
+
+    def _model(self, model: str) -> _ModelStats:
+        if model not in self._models:
+            self._models[model] = _ModelStats()
+        return self._models[model]
+
+    def record(
+        self,
+        model: str,
+        latency: float,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        ttft: Optional[float] = None,
+        eval_seconds: Optional[float] = None,
+        prompt_eval_seconds: Optional[float] = None,
+        load_seconds: Optional[float] = None,
+    ) -> None:
+        stats = self._model(model)
+        stats.requests += 1
+        stats.latency.record(latency)
+
+        if ttft is not None:
+            stats.ttft.record(ttft)
+        if prompt_tokens:
+            stats.prompt_tokens += prompt_tokens
+        if completion_tokens:
+            stats.completion_tokens += completion_tokens
+            stats.generation_seconds += latency - (ttft or 0.0)
+        if eval_seconds:
+            stats.eval_seconds += eval_seconds
+        if prompt_eval_seconds:
+            stats.prompt_eval_seconds += prompt_eval_seconds
+        if load_seconds:
+            stats.load_seconds += load_seconds
+
+        self.last_request_ts = time.time()
+
+    def record_error(self, model: str, latency: float) -> None:
+        stats = self._model(model)
+        stats.requests += 1
+        stats.errors += 1
+        stats.latency.record(latency)
+        self.last_request_ts = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        requests = sum(s.requests for s in self._models.values())
+        total = sum(s.latency.total for s in self._models.values())
+
+        return {
+            "requests": requests,
+            "errors": sum(s.errors for s in self._models.values()),
+            "avg_latency": total / requests if requests else 0.0,
+            "last_request_ts": self.last_request_ts,
+            "models": {
+                model: stats.snapshot()
+                for model, stats in self._models.items()
+            },
+        }
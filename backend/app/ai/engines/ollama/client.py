@@ -0,0 +1,27 @@
+import httpx
+from app.core.config import Config
+
+
+def build_client() -> httpx.AsyncClient:
+    """
+    Long-lived pooled HTTP client for an Ollama engine.
+
+    - Keep-alive connections are reused across generations and probes
+    - Pool limits and connect/read timeouts are configurable via .env
+    """
+    limits = httpx.Limits(
+        max_connections=int(Config.get("OLLAMA_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=int(
+            Config.get("OLLAMA_MAX_KEEPALIVE", 10)
+        ),
+        keepalive_expiry=float(Config.get("OLLAMA_KEEPALIVE_EXPIRY", 60)),
+    )
+
+    timeout = httpx.Timeout(
+        connect=float(Config.get("OLLAMA_CONNECT_TIMEOUT", 5)),
+        read=float(Config.get("OLLAMA_READ_TIMEOUT", 120)),
+        write=float(Config.get("OLLAMA_WRITE_TIMEOUT", 10)),
+        pool=float(Config.get("OLLAMA_POOL_TIMEOUT", 5)),
+    )
+
+    return httpx.AsyncClient(limits=limits, timeout=timeout)
@@ -0,0 +1,163 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import Config
+
+
+class _Conversation:
+    __slots__ = ("model", "system", "tokens", "endpoint", "updated")
+
+    def __init__(self, model: str, system: str, tokens: List[int], endpoint: str):
+        self.model = model
+        self.system = system
+        self.tokens = tokens
+        self.endpoint = endpoint
+        self.updated = time.monotonic()
+
+
+class ConversationStore:
+    """
+    Bounded store of Ollama KV `context` handles, one per conversation.
+
+    - Follow-up turns send the handle back so Ollama skips re-evaluating
+      the conversation prefix
+    - Handles are dropped when the model or system prompt changes,
+      after OLLAMA_CONVERSATION_TTL, or past OLLAMA_CONVERSATION_MAX_TOKENS
+    - LRU-evicted beyond OLLAMA_CONVERSATION_MAX entries
+    - Tracks reused tokens and the prompt-eval time they saved
+    """
+
+    def __init__(self):
+        self.enabled = Config.get(
+            "OLLAMA_CONVERSATION_REUSE", "true"
+        ).lower() == "true"
+        self.max_entries = int(Config.get("OLLAMA_CONVERSATION_MAX", 500))
+        self.ttl = float(Config.get("OLLAMA_CONVERSATION_TTL", 1800))
+        self.max_tokens = int(
+            Config.get("OLLAMA_CONVERSATION_MAX_TOKENS", 4096)
+        )
+
+        self._entries: "OrderedDict[str, _Conversation]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+        self.evictions = 0
+        self.reused_tokens = 0
+        self.seconds_saved = 0.0
+
+        # Measured cost of evaluating one prompt token, from real responses
+        self._eval_seconds = 0.0
+        self._eval_tokens = 0
+
+    @staticmethod
+    def _digest(system: str) -> str:
+        return hashlib.sha256(system.encode()).hexdigest()
+
+    def get(
+        self,
+        conversation: Optional[str],
+        model: str,
+        system: str,
+    ) -> Optional[_Conversation]:
+        """
+        Handle to continue from, or None to start a fresh context.
+        """
+        if not self.enabled or not conversation:
+            return None
+
+        entry = self._entries.get(conversation)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if (
+            entry.model != model
+            or entry.system != self._digest(system)
+            or time.monotonic() - entry.updated > self.ttl
+        ):
+            del self._entries[conversation]
+            self.resets += 1
+            return None
+
+        self._entries.move_to_end(conversation)
+        self.hits += 1
+        return entry
+
+    def model_of(self, conversation: Optional[str]) -> Optional[str]:
+        """
+        Model of a conversation's live handle (no hit / miss counted).
+        """
+        if not self.enabled or not conversation:
+            return None
+
+        entry = self._entries.get(conversation)
+        if entry is None or time.monotonic() - entry.updated > self.ttl:
+            return None
+        return entry.model
+
+    def put(
+        self,
+        conversation: Optional[str],
+        model: str,
+        system: str,
+        tokens: Optional[List[int]],
+        endpoint: str,
+    ) -> None:
+        if not self.enabled or not conversation or not tokens:
+            return
+
+        if len(tokens) > self.max_tokens:
+            # Past the model window Ollama would truncate anyway: start over
+            if self._entries.pop(conversation, None) is not None:
+                self.resets += 1
+            return
+
+        self._entries[conversation] = _Conversation(
+            model, self._digest(system), tokens, endpoint
+        )
+        self._entries.move_to_end(conversation)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def reset(self, conversation: Optional[str] = None) -> None:
+        if conversation is None:
+            self.resets += len(self._entries)
+            self._entries.clear()
+        elif self._entries.pop(conversation, None) is not None:
+            self.resets += 1
+
+    def record(self, reused: Optional[_Conversation], data: Dict[str, Any]) -> None:
+        """
+        Update the per-token prompt-eval cost and credit the tokens a
+        reused handle kept Ollama from evaluating again.
+        """
+        count = data.get("prompt_eval_count") or 0
+        duration = (data.get("prompt_eval_duration") or 0) / 1e9
+        if count and duration:
+            self._eval_tokens += count
+            self._eval_seconds += duration
+
+        if reused is not None:
+            self.reused_tokens += len(reused.tokens)
+            if self._eval_tokens:
+                self.seconds_saved += (
+                    len(reused.tokens) * self._eval_seconds / self._eval_tokens
+                )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "conversations": len(self._entries),
+            "max": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "resets": self.resets,
+            "evictions": self.evictions,
+            "reused_tokens": self.reused_tokens,
+            "prompt_eval_seconds_saved": self.seconds_saved,
+        }
@@ -1,76 +1,355 @@
+import asyncio
+import json
 import time
-import httpx
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
+from app.ai.context_manager import ContextManager
 from app.core.config import Config
+from app.monitoring.logs import log
 from ..base import BaseAIEngine
 from .metrics import OllamaMetrics
-from .health import OllamaHealth
+from .client import build_client
+from .pool import HostPool
+from .residency import ModelResidency
+from .conversations import ConversationStore
+from .tiering import ModelTiering
+
+
+# load_duration above this means the model was cold for that request
+COLD_LOAD_SECONDS = 0.1
 
 
 class OllamaEngine(BaseAIEngine):
     """
     Ollama local LLM engine.
 
-    - Connects via HTTP to a locally hosted Ollama server
-    - Model and endpoint are configurable via .env
+    - Connects via HTTP to one or more Ollama servers (OLLAMA_HOSTS)
+    - Balances requests to the least-loaded healthy host
+    - Model and endpoints are configurable via .env
     - Supports ANY Ollama model name (llama3, llama3:8b, mistral, etc.)
+    - Keeps one pooled keep-alive client for generation + health probes
+    - Preloads models and keeps them resident (see ModelResidency)
+    - Reuses the KV context across conversation turns (see ConversationStore)
+    - Sends simple messages to a small model when configured (see ModelTiering)
     """
 
     def __init__(
         self,
         model: Optional[str] = None,
         endpoint: Optional[str] = None,
+        endpoints: Optional[List[str]] = None,
     ):
         super().__init__(engine_id="ollama")
 
         # Load from environment with safe defaults
         self.model = model or Config.get("OLLAMA_MODEL", "llama3")
-        self.endpoint = endpoint or Config.get(
-            "OLLAMA_HOST", "http://localhost:11434"
-        )
 
+        if endpoints is None:
+            hosts = endpoint or Config.get("OLLAMA_HOSTS") or Config.get(
+                "OLLAMA_HOST", "http://localhost:11434"
+            )
+            endpoints = [h.strip() for h in hosts.split(",") if h.strip()]
+
+        self.embed_model = Config.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+        self.client = build_client()
+        self.pool = HostPool(endpoints, self.client)
         self.metrics_collector = OllamaMetrics()
-        self.health_checker = OllamaHealth(self.endpoint)
+        self.residency = ModelResidency(self)
+        self.conversations = ConversationStore()
+        self.tiering = ModelTiering()
 
-    async def generate(self, prompt: str, context: Dict[str, Any]) -> str:
+    async def start(self) -> None:
+        # Warm up in the background so registration never blocks on a load
+        asyncio.create_task(self._warm_up())
+        self.residency.start()
+
+    async def _warm_up(self) -> None:
+        models = [self.model]
+        if self.tiering.enabled:
+            models.append(self.tiering.small_model)
+
+        for model in models:
+            try:
+                await self.residency.ensure(model)
+            except Exception as e:
+                # Health prober will surface an unreachable server
+                await log(f"Ollama warm-up failed for {model}: {e}")
+
+    async def _load_on(
+        self,
+        endpoint: str,
+        model: str,
+        keep_alive: Any,
+    ) -> float:
         start = time.perf_counter()
 
+        response = await self.client.post(
+            f"{endpoint}/api/generate",
+            json={"model": model, "prompt": "", "keep_alive": keep_alive},
+        )
+        response.raise_for_status()
+
+        data = response.json()
+        return data.get("load_duration", 0) / 1e9 or (
+            time.perf_counter() - start
+        )
+
+    async def load_model(
+        self,
+        model: str,
+        keep_alive: Any,
+        record: bool = True,
+    ) -> float:
+        """
+        Load (or refresh) a model on every host without generating.
+        Returns the slowest host's load time in seconds.
+        """
+        results = await asyncio.gather(
+            *(
+                self._load_on(h.endpoint, model, keep_alive)
+                for h in self.pool.hosts
+            ),
+            return_exceptions=True,
+        )
+
+        loaded = [r for r in results if not isinstance(r, Exception)]
+        if not loaded:
+            raise RuntimeError(f"Ollama model load failed: {results[0]}")
+
+        seconds = max(loaded)
+        if record:
+            self.metrics_collector.record_load(model, seconds)
+        return seconds
+
+    async def ping_model(self, model: str, keep_alive: Any) -> None:
+        """
+        Refresh a resident model's keep_alive; not counted as a load.
+        """
+        await self.load_model(model, keep_alive, record=False)
+
+    async def unload_model(self, model: str) -> None:
+        await asyncio.gather(
+            *(
+                self.client.post(
+                    f"{h.endpoint}/api/generate",
+                    json={"model": model, "prompt": "", "keep_alive": 0},
+                )
+                for h in self.pool.hosts
+            ),
+            return_exceptions=True,
+        )
+
+    async def set_model(self, model: str) -> None:
+        """
+        Switch models only after the new one is resident,
+        so the next conversation turn never pays a cold load.
+        """
+        await self.residency.ensure(model)
+        self.model = model
+        self.pool.set_model(model)
+
+    def _select(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+        count: bool = True,
+    ) -> Tuple[str, str]:
+        """
+        (tier, model), keeping a conversation on its live handle's model.
+        """
+        held = self.conversations.model_of(context.get("conversation"))
+        return self.tiering.select(prompt, self.model, held, count)
+
+    def model_for(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Model a prompt is served by, after tiering.
+        """
+        return self._select(prompt, context or {}, count=False)[1]
+
+    def _record(
+        self,
+        model: str,
+        latency: float,
+        data: Dict[str, Any],
+        ttft: Optional[float] = None,
+    ) -> None:
+        load = data.get("load_duration", 0) / 1e9
+        if load >= COLD_LOAD_SECONDS:
+            self.metrics_collector.record_load(model, load)
+
+        self.residency.touch(model)
+        self.metrics_collector.record_response(model, latency, data, ttft)
+
+    def _payload(
+        self,
+        model: str,
+        prompt: str,
+        context: Dict[str, Any],
+        stream: bool,
+        handle=None,
+    ) -> Dict[str, Any]:
         payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False,
+            "model": model,
+            "prompt": ContextManager.user_turn(prompt, context),
+            "stream": stream,
+            "keep_alive": self.residency.keep_alive,
         }
+        if context.get("system"):
+            payload["system"] = context["system"]
+        if handle is not None:
+            payload["context"] = handle.tokens
+        return payload
 
-        async with httpx.AsyncClient(timeout=120) as client:
-            try:
-                response = await client.post(
-                    f"{self.endpoint}/api/generate",
+    def _remember(
+        self,
+        context: Dict[str, Any],
+        model: str,
+        handle,
+        data: Dict[str, Any],
+        endpoint: str,
+    ) -> None:
+        self.conversations.record(handle, data)
+        self.conversations.put(
+            context.get("conversation"),
+            model,
+            context.get("system", ""),
+            data.get("context"),
+            endpoint,
+        )
+
+    async def generate(self, prompt: str, context: Dict[str, Any]) -> str:
+        start = time.perf_counter()
+
+        tier, model = self._select(prompt, context)
+        handle = self.conversations.get(
+            context.get("conversation"), model, context.get("system", "")
+        )
+        payload = self._payload(
+            model, prompt, context, stream=False, handle=handle
+        )
+
+        try:
+            async with self.pool.acquire(
+                prefer=handle.endpoint if handle else None,
+            ) as host:
+                response = await self.client.post(
+                    f"{host.endpoint}/api/generate",
                     json=payload,
                 )
                 response.raise_for_status()
-            except Exception as e:
-                raise RuntimeError(f"Ollama request failed: {e}")
-
-            data = response.json()
+        except Exception as e:
+            latency = time.perf_counter() - start
+            self.metrics_collector.record_error(model, latency)
+            self.tiering.record(tier, latency, ok=False)
+            if handle is not None:
+                # Don't keep replaying a context that may have caused this
+                self.conversations.reset(context.get("conversation"))
+            raise RuntimeError(f"Ollama request failed: {e}")
 
-        duration = time.perf_counter() - start
+        data = response.json()
 
-        # Token estimate based on prompt length (simple + safe)
-        self.metrics_collector.record(duration, len(prompt))
+        latency = time.perf_counter() - start
+        self._record(model, latency, data)
+        self.tiering.record(tier, latency)
+        self._remember(context, model, handle, data, host.endpoint)
 
         return data.get("response", "").strip()
 
+    async def stream(
+        self,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> AsyncIterator[str]:
+        start = time.perf_counter()
+
+        tier, model = self._select(prompt, context)
+        handle = self.conversations.get(
+            context.get("conversation"), model, context.get("system", "")
+        )
+        payload = self._payload(
+            model, prompt, context, stream=True, handle=handle
+        )
+        data: Dict[str, Any] = {}
+        ttft: Optional[float] = None
+
+        try:
+            async with self.pool.acquire(
+                prefer=handle.endpoint if handle else None,
+            ) as host, self.client.stream(
+                "POST",
+                f"{host.endpoint}/api/generate",
+                json=payload,
+            ) as response:
+                response.raise_for_status()
+
+                # Ollama streams NDJSON: one object per line, last has done=true
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+
+                    data = json.loads(line)
+                    token = data.get("response", "")
+                    if token:
+                        if ttft is None:
+                            ttft = time.perf_counter() - start
+                        yield token
+
+                    if data.get("done"):
+                        break
+        except Exception as e:
+            latency = time.perf_counter() - start
+            self.metrics_collector.record_error(model, latency)
+            self.tiering.record(tier, latency, ok=False)
+            if handle is not None:
+                # Don't keep replaying a context that may have caused this
+                self.conversations.reset(context.get("conversation"))
+            raise RuntimeError(f"Ollama stream failed: {e}")
+
+        # Final NDJSON object carries load/eval timings
+        latency = time.perf_counter() - start
+        self._record(model, latency, data, ttft)
+        self.tiering.record(tier, latency)
+        self._remember(context, model, handle, data, host.endpoint)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Batch-embed texts through Ollama's /api/embed endpoint.
+        Failures here don't count against host health.
+        """
+        try:
+            async with self.pool.acquire(track=False) as host:
+                response = await self.client.post(
+                    f"{host.endpoint}/api/embed",
+                    json={"model": self.embed_model, "input": texts},
+                )
+                response.raise_for_status()
+        except Exception as e:
+            raise RuntimeError(f"Ollama embedding failed: {e}")
+
+        return response.json().get("embeddings", [])
+
     async def health_check(self) -> bool:
-        self.healthy = await self.health_checker.check()
+        self.healthy = await self.pool.check()
         return self.healthy
 
+    async def shutdown(self) -> None:
+        await self.residency.stop()
+        await self.client.aclose()
+
     def metrics(self) -> Dict[str, Any]:
         snapshot = self.metrics_collector.snapshot()
         snapshot.update(
             {
                 "model": self.model,
-                "endpoint": self.endpoint,
+                "hosts": self.pool.snapshot(),
+                "residency": self.residency.snapshot(),
+                "conversations": self.conversations.snapshot(),
+                "tiering": self.tiering.snapshot(),
             }
         )
         return snapshot
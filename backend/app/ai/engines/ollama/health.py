@@ -8,13 +8,20 @@ class OllamaHealth:
 
     - Verifies Ollama server is reachable
     - Optionally verifies configured model exists
+    - Reuses the engine's pooled client when one is provided
     """
 
-    def __init__(self, endpoint: str | None = None):
+    def __init__(
+        self,
+        endpoint: str | None = None,
+        client: httpx.AsyncClient | None = None,
+    ):
         self.endpoint = endpoint or Config.get(
             "OLLAMA_HOST", "http://localhost:11434"
         )
         self.model = Config.get("OLLAMA_MODEL")
+        self.client = client
+        self.timeout = float(Config.get("OLLAMA_HEALTH_TIMEOUT", 5))
 
     async def check(self) -> bool:
         """
@@ -23,18 +30,25 @@ class OllamaHealth:
         - AND (if OLLAMA_MODEL is set) model exists
         """
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                r = await client.get(f"{self.endpoint}/api/tags")
-                r.raise_for_status()
+            if self.client is not None:
+                r = await self.client.get(
+                    f"{self.endpoint}/api/tags",
+                    timeout=self.timeout,
+                )
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    r = await client.get(f"{self.endpoint}/api/tags")
 
-                # If no model specified, server health is enough
-                if not self.model:
-                    return True
+            r.raise_for_status()
 
-                data = r.json()
-                models = [m["name"] for m in data.get("models", [])]
+            # If no model specified, server health is enough
+            if not self.model:
+                return True
 
-                return self.model in models
+            data = r.json()
+            models = [m["name"] for m in data.get("models", [])]
+
+            return self.model in models
 
         except Exception:
             return False
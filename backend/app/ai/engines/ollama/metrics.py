@@ -1,24 +1,61 @@
-import time
-from typing import Dict
+from typing import Any, Dict, Optional
 
+from ..metrics import EngineMetrics
+
+
+NS = 1e9
+
+
+class OllamaMetrics(EngineMetrics):
+    """
+    EngineMetrics fed from Ollama's own response timings.
+    """
 
-class OllamaMetrics:
     def __init__(self):
-        self.requests = 0
-        self.total_latency = 0.0
-        self.last_request_ts = None
-
-    def record(self, latency: float, tokens: int):
-        self.requests += 1
-        self.total_latency += latency
-        self.last_request_ts = time.time()
-
-    def snapshot(self) -> Dict[str, float]:
-        avg_latency = (
-            self.total_latency / self.requests if self.requests else 0.0
+        super().__init__()
+        self.loads: Dict[str, Dict[str, float]] = {}
+
+    def record_response(
+        self,
+        model: str,
+        latency: float,
+        data: Dict[str, Any],
+        ttft: Optional[float] = None,
+    ):
+        """
+        Record a finished /api/generate response (or final stream object).
+        Durations in the payload are nanoseconds.
+        """
+        self.record(
+            model,
+            latency,
+            prompt_tokens=data.get("prompt_eval_count"),
+            completion_tokens=data.get("eval_count"),
+            ttft=ttft,
+            eval_seconds=data.get("eval_duration", 0) / NS,
+            prompt_eval_seconds=data.get("prompt_eval_duration", 0) / NS,
+            load_seconds=data.get("load_duration", 0) / NS,
+        )
+
+    def record_load(self, model: str, seconds: float):
+        """
+        Model load time, tracked apart from generation latency.
+        """
+        stats = self.loads.setdefault(
+            model, {"count": 0, "total": 0.0, "last": 0.0}
         )
-        return {
-            "requests": self.requests,
-            "avg_latency": avg_latency,
-            "last_request_ts": self.last_request_ts,
+        stats["count"] += 1
+        stats["total"] += seconds
+        stats["last"] = seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["model_loads"] = {
+            model: {
+                "count": s["count"],
+                "avg_seconds": s["total"] / s["count"],
+                "last_seconds": s["last"],
+            }
+            for model, s in self.loads.items()
         }
+        return snapshot
@@ -0,0 +1,131 @@
+import asyncio
+import contextlib
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+from app.core.config import Config
+from .health import OllamaHealth
+
+
+class OllamaHost:
+    """
+    One Ollama endpoint with its live load and latency state.
+    """
+
+    def __init__(self, endpoint: str, client: httpx.AsyncClient):
+        self.endpoint = endpoint.rstrip("/")
+        self.health_checker = OllamaHealth(self.endpoint, client=client)
+
+        self.in_flight = 0
+        self.latency = 0.0  # EWMA of request latency
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "latency_ewma": self.latency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "ejected": self.ejected,
+        }
+
+
+class HostPool:
+    """
+    Least-outstanding-requests balancing across Ollama hosts.
+
+    - Picks the non-ejected host with the fewest in-flight requests,
+      breaking ties on rolling latency
+    - Keeps a conversation on the host that served its previous turn
+    - Ejects a host for OLLAMA_EJECT_SECONDS after
+      OLLAMA_EJECT_FAILURES consecutive failures
+    """
+
+    def __init__(self, endpoints: List[str], client: httpx.AsyncClient):
+        self.hosts = [OllamaHost(e, client) for e in endpoints]
+        self.eject_failures = int(Config.get("OLLAMA_EJECT_FAILURES", 3))
+        self.eject_seconds = float(Config.get("OLLAMA_EJECT_SECONDS", 30))
+        self.alpha = float(Config.get("OLLAMA_LATENCY_EWMA_ALPHA", 0.2))
+
+    def pick(self, prefer: Optional[str] = None) -> OllamaHost:
+        candidates = [h for h in self.hosts if not h.ejected] or self.hosts
+        best = min(candidates, key=lambda h: (h.in_flight, h.latency))
+
+        # Stick to the host holding a conversation's KV cache
+        # unless it is clearly busier than the best alternative
+        for host in candidates:
+            if host.endpoint == prefer and host.in_flight <= best.in_flight + 1:
+                return host
+        return best
+
+    def _eject(self, host: OllamaHost) -> None:
+        host.ejected_until = time.monotonic() + self.eject_seconds
+
+    @contextlib.asynccontextmanager
+    async def acquire(
+        self,
+        prefer: Optional[str] = None,
+        track: bool = True,
+    ) -> AsyncIterator[OllamaHost]:
+        """
+        track=False still balances the request, but keeps its outcome
+        out of host latency and ejection (e.g. embedding calls).
+        """
+        host = self.pick(prefer)
+        host.in_flight += 1
+        start = time.perf_counter()
+
+        try:
+            yield host
+        except Exception:
+            if track:
+                host.errors += 1
+                host.consecutive_failures += 1
+                if host.consecutive_failures >= self.eject_failures:
+                    self._eject(host)
+            raise
+        else:
+            if track:
+                latency = time.perf_counter() - start
+                host.latency = (
+                    latency if not host.requests
+                    else self.alpha * latency + (1 - self.alpha) * host.latency
+                )
+                host.consecutive_failures = 0
+        finally:
+            host.in_flight -= 1
+            if track:
+                host.requests += 1
+
+    async def check(self) -> bool:
+        """
+        Probe every host in parallel; unhealthy hosts are ejected and
+        recovered hosts readmitted. Healthy if any host is.
+        """
+        results = await asyncio.gather(
+            *(h.health_checker.check() for h in self.hosts)
+        )
+
+        for host, healthy in zip(self.hosts, results):
+            if healthy:
+                host.ejected_until = 0.0
+                host.consecutive_failures = 0
+            else:
+                self._eject(host)
+
+        return any(results)
+
+    def set_model(self, model: str) -> None:
+        for host in self.hosts:
+            host.health_checker.model = model
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {h.endpoint: h.snapshot() for h in self.hosts}
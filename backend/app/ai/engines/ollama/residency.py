@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import Config
+from app.monitoring.logs import log
+
+
+def _parse_hours(raw: str) -> Tuple[int, int]:
+    start, _, end = str(raw).partition("-")
+    return int(start or 0), int(end or 24)
+
+
+class ModelResidency:
+    """
+    Keeps Ollama models loaded where it matters.
+
+    - Preloads models before they are used (warm-up)
+    - Re-pings resident models with keep_alive during active hours
+    - Bounds resident models with an LRU policy, unloading the coldest
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.keep_alive = Config.get("OLLAMA_KEEP_ALIVE", "30m")
+        self.max_resident = int(Config.get("OLLAMA_MAX_RESIDENT_MODELS", 2))
+        self.interval = float(Config.get("OLLAMA_RESIDENCY_INTERVAL", 240))
+        self.active_hours = _parse_hours(
+            Config.get("OLLAMA_ACTIVE_HOURS", "0-24")
+        )
+
+        self._resident: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def touch(self, model: str) -> None:
+        if model in self._resident:
+            self._resident[model] = time.time()
+            self._resident.move_to_end(model)
+
+    def in_active_hours(self) -> bool:
+        start, end = self.active_hours
+        hour = time.localtime().tm_hour
+        if start <= end:
+            return start <= hour < end
+        # Window wraps midnight, e.g. 22-6
+        return hour >= start or hour < end
+
+    async def ensure(self, model: str) -> None:
+        """
+        Load a model if it is not resident, evicting the LRU one.
+        """
+        async with self._lock:
+            if model in self._resident:
+                self.touch(model)
+                return
+
+            await self.engine.load_model(model, self.keep_alive)
+            self._resident[model] = time.time()
+
+            while len(self._resident) > self.max_resident:
+                coldest, _ = self._resident.popitem(last=False)
+                try:
+                    await self.engine.unload_model(coldest)
+                    await log(f"Ollama model unloaded (LRU): {coldest}")
+                except Exception as e:
+                    await log(f"Ollama unload failed for {coldest}: {e}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+
+            # Outside active hours Ollama's own keep_alive lets them expire
+            if not self.in_active_hours():
+                continue
+
+            for model in list(self._resident):
+                try:
+                    await self.engine.ping_model(model, self.keep_alive)
+                except Exception as e:
+                    await log(f"Ollama keep-resident ping failed for {model}: {e}")
+
+    def snapshot(self):
+        return {
+            "keep_alive": self.keep_alive,
+            "max_resident": self.max_resident,
+            "resident": list(self._resident),
+            "active_hours": "-".join(map(str, self.active_hours)),
+        }
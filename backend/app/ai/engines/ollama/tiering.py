@@ -0,0 +1,140 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from app.core.config import Config
+from ..metrics import LatencyHistogram
+
+
+SIMPLE = "simple"
+COMPLEX = "complex"
+
+AUTO = "auto"
+MODES = (AUTO, SIMPLE, COMPLEX)
+
+# Asking for reasoning rather than a reaction
+_REASONING = frozenset(
+    ("why", "compare", "difference", "summarize", "analyze", "write")
+)
+_HOW_TO = re.compile(r"\bhow (do|does|did|can|could|would|should|to)\b")
+_CODE = re.compile(r"```|`[^`]+`|\bdef |\bclass |\bimport |[{}]\s*$", re.M)
+_WORD = re.compile(r"[a-z']+")
+
+
+@lru_cache(maxsize=1)
+def _focus_keywords() -> FrozenSet[str]:
+    # Imported lazily: app.cognition pulls in app.memory
+    from app.cognition.emotion_model import EmotionModel
+
+    return frozenset(EmotionModel.KEYWORDS["focus"])
+
+
+def classify(text: str) -> str:
+    """
+    Cheap complexity estimate for one message.
+
+    Complex: code, long or multi-line text, several questions,
+    focus keywords (EmotionModel) or reasoning verbs.
+    Everything else (greetings, one-liners) is simple.
+    """
+    if _CODE.search(text):
+        return COMPLEX
+
+    if len(text) > int(Config.get("OLLAMA_TIER_MAX_SIMPLE_CHARS", 160)):
+        return COMPLEX
+    if text.count("\n") >= 2 or text.count("?") > 1:
+        return COMPLEX
+
+    lowered = text.lower()
+    words = set(_WORD.findall(lowered))
+    if words & (_focus_keywords() | _REASONING) or _HOW_TO.search(lowered):
+        return COMPLEX
+
+    return SIMPLE
+
+
+class ModelTiering:
+    """
+    Routes simple messages to a small Ollama model.
+
+    - Enabled when OLLAMA_SMALL_MODEL is set
+    - Mode "auto" classifies each prompt; "simple" / "complex" force a
+      tier (dashboard override)
+    - In auto mode a conversation with a live KV handle stays on that
+      handle's model: switching would drop its earlier turns. "held"
+      counts messages answered by the other tier's model because of it
+    - Per-tier request counts and latency histograms
+    """
+
+    def __init__(self):
+        self.small_model: Optional[str] = Config.get("OLLAMA_SMALL_MODEL")
+        self.mode = AUTO
+        self.requests = {SIMPLE: 0, COMPLEX: 0}
+        self.errors = {SIMPLE: 0, COMPLEX: 0}
+        # Classified tier -> messages kept on the conversation's model
+        self.held = {SIMPLE: 0, COMPLEX: 0}
+        self.latency = {SIMPLE: LatencyHistogram(), COMPLEX: LatencyHistogram()}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.small_model)
+
+    def set_mode(self, mode: str) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown tier mode '{mode}'")
+        self.mode = mode
+
+    def tier(self, prompt: str) -> str:
+        if not self.enabled:
+            return COMPLEX
+        if self.mode != AUTO:
+            return self.mode
+        return classify(prompt)
+
+    def model_for(self, tier: str, large_model: str) -> str:
+        return self.small_model if tier == SIMPLE and self.enabled else large_model
+
+    def select(
+        self,
+        prompt: str,
+        large_model: str,
+        held: Optional[str] = None,
+        count: bool = True,
+    ) -> Tuple[str, str]:
+        """
+        (tier, model) for one message. `held` is the model of the
+        conversation's live KV handle, if any.
+        """
+        tier = self.tier(prompt)
+        if (
+            self.enabled
+            and self.mode == AUTO
+            and held in (self.small_model, large_model)
+        ):
+            kept = SIMPLE if held == self.small_model else COMPLEX
+            if kept != tier and count:
+                self.held[tier] += 1
+            return kept, held
+        return tier, self.model_for(tier, large_model)
+
+    def record(self, tier: str, latency: float, ok: bool = True) -> None:
+        self.requests[tier] += 1
+        self.latency[tier].record(latency)
+        if not ok:
+            self.errors[tier] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "small_model": self.small_model,
+            "tiers": {
+                tier: {
+                    "requests": self.requests[tier],
+                    "errors": self.errors[tier],
+                    "held": self.held[tier],
+                    "latency": self.latency[tier].snapshot(),
+                }
+                for tier in (SIMPLE, COMPLEX)
+            },
+        }
@@ -0,0 +1,140 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from .engine_registry import ENGINE_REGISTRY
+from app.core.config import Config
+from app.core.event_bus import EVENT_BUS
+from app.monitoring.logs import log
+
+
+class HealthProber:
+    """
+    Background engine health prober.
+
+    - Probes every registered engine on an interval, in parallel
+    - Each probe is bounded by a timeout
+    - Results are cached so the request path never waits on a probe
+    - Real request outcomes update the cache immediately
+    """
+
+    def __init__(self):
+        self.interval = float(Config.get("ENGINE_HEALTH_INTERVAL", 15))
+        self.timeout = float(Config.get("ENGINE_HEALTH_TIMEOUT", 5))
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.probe_all()
+            except Exception as e:
+                await log(f"Engine health probe cycle failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _probe(self, engine_id: str, engine) -> None:
+        start = time.perf_counter()
+        try:
+            healthy = bool(
+                await asyncio.wait_for(engine.health_check(), self.timeout)
+            )
+            reason = None if healthy else "health check failed"
+        except asyncio.TimeoutError:
+            healthy, reason = False, "health check timed out"
+        except Exception as e:
+            healthy, reason = False, str(e)
+
+        await self._update(
+            engine_id,
+            healthy,
+            reason,
+            latency=time.perf_counter() - start,
+        )
+
+    async def probe_all(self) -> Dict[str, Dict[str, Any]]:
+        engines = await ENGINE_REGISTRY.list()
+        await asyncio.gather(
+            *(self._probe(eid, engine) for eid, engine in engines.items())
+        )
+
+        # Forget engines that were unregistered since the last cycle
+        for engine_id in list(self._status):
+            if engine_id not in engines:
+                self._status.pop(engine_id, None)
+
+        return self.snapshot()
+
+    async def _update(
+        self,
+        engine_id: str,
+        healthy: bool,
+        reason: Optional[str] = None,
+        latency: Optional[float] = None,
+    ) -> None:
+        previous = self._status.get(engine_id, {}).get("healthy")
+
+        self._status[engine_id] = {
+            "healthy": healthy,
+            "checked_at": time.time(),
+            "latency": latency,
+            "reason": reason,
+        }
+
+        if previous is not None and previous != healthy:
+            await log(
+                f"Engine {engine_id} is now "
+                f"{'healthy' if healthy else 'unhealthy'}"
+                + (f": {reason}" if reason else "")
+            )
+            await EVENT_BUS.emit(
+                "engine.health",
+                engine_id=engine_id,
+                healthy=healthy,
+            )
+
+    async def mark_unhealthy(self, engine_id: str, reason: str) -> None:
+        await self._update(engine_id, False, reason)
+
+    async def mark_healthy(self, engine_id: str) -> None:
+        if not self._status.get(engine_id, {}).get("healthy", True):
+            await self._update(engine_id, True)
+
+    def is_healthy(self, engine_id: str) -> bool:
+        """
+        Cached health lookup (never blocks).
+        Unknown or stale entries are treated as healthy so a missed
+        probe never blocks traffic; real failures still mark them down.
+        """
+        status = self._status.get(engine_id)
+        if not status:
+            return True
+
+        age = time.time() - status["checked_at"]
+        if age > self.interval * 3:
+            return True
+
+        return status["healthy"]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        return {
+            engine_id: {**status, "age": now - status["checked_at"]}
+            for engine_id, status in self._status.items()
+        }
+
+
+# Global singleton
+HEALTH_PROBER = HealthProber()
@@ -0,0 +1,67 @@
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Tuple
+
+from app.core.config import Config
+
+
+class HedgePolicy:
+    """
+    Hedged-request policy for EngineRouter.
+
+    - Tracks recent primary latencies (full reply and first token)
+    - A primary cancelled before finishing contributes its elapsed
+      time (a lower bound), so slow tails are not dropped from the
+      samples and the delay does not drift down
+    - Derives the hedge delay from a configurable percentile
+    - Counts how often hedges fire and which side wins
+    """
+
+    def __init__(self):
+        self.enabled = str(
+            Config.get("ROUTER_HEDGE_ENABLED", "false")
+        ).lower() in ("1", "true", "yes")
+        self.percentile = float(Config.get("ROUTER_HEDGE_PERCENTILE", 0.95))
+        self.default_delay = float(Config.get("ROUTER_HEDGE_DEFAULT_DELAY", 10))
+        self.min_delay = float(Config.get("ROUTER_HEDGE_MIN_DELAY", 0.5))
+        self.max_delay = float(Config.get("ROUTER_HEDGE_MAX_DELAY", 30))
+        self.min_samples = int(Config.get("ROUTER_HEDGE_MIN_SAMPLES", 20))
+
+        self._samples: Dict[Tuple[str, str], Deque[float]] = defaultdict(
+            lambda: deque(maxlen=200)
+        )
+        self.counters = {
+            "fired": 0,
+            "hedge_won": 0,
+            "primary_won": 0,
+            "both_failed": 0,
+        }
+
+    def observe(self, engine_id: str, latency: float, kind: str) -> None:
+        """
+        kind is "generate" (full reply) or "first_token" (streaming).
+        Censored samples (elapsed time at cancellation) go here too.
+        """
+        self._samples[(engine_id, kind)].append(latency)
+
+    def delay(self, engine_id: str, kind: str) -> float:
+        samples = self._samples.get((engine_id, kind))
+        if not samples or len(samples) < self.min_samples:
+            return self.default_delay
+
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile))
+        return max(self.min_delay, min(ordered[index], self.max_delay))
+
+    def record(self, outcome: str) -> None:
+        self.counters[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            **self.counters,
+            "delays": {
+                f"{engine_id}:{kind}": self.delay(engine_id, kind)
+                for engine_id, kind in self._samples
+            },
+        }
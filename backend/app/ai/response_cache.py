@@ -0,0 +1,109 @@
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.config import Config
+from .single_flight import context_digest, normalize_prompt
+
+
+class ResponseCache:
+    """
+    Exact-match response cache in front of EngineRouter.
+
+    - Keyed on engine id, model, normalized prompt and rendered context
+    - Size-bounded LRU eviction with a per-entry TTL
+    - Guilds can opt out at runtime or via RESPONSE_CACHE_DISABLED_GUILDS
+    """
+
+    def __init__(self):
+        self.enabled = str(
+            Config.get("RESPONSE_CACHE_ENABLED", "true")
+        ).lower() in ("1", "true", "yes")
+        self.max_entries = int(Config.get("RESPONSE_CACHE_SIZE", 1000))
+        self.ttl = float(Config.get("RESPONSE_CACHE_TTL", 600))
+
+        self.disabled_guilds: Set[str] = {
+            g.strip()
+            for g in str(
+                Config.get("RESPONSE_CACHE_DISABLED_GUILDS", "")
+            ).split(",")
+            if g.strip()
+        }
+
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"hits": 0, "misses": 0, "evictions": 0}
+        )
+
+    @staticmethod
+    def key(
+        engine_id: str,
+        model: str,
+        prompt: str,
+        context: Dict[str, Any],
+    ) -> str:
+        raw = (
+            f"{engine_id}\0{model}\0{normalize_prompt(prompt)}\0"
+            f"{context_digest(context)}"
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def applies(self, guild_id: Optional[str]) -> bool:
+        return self.enabled and guild_id not in self.disabled_guilds
+
+    def get(self, engine_id: str, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._entries.pop(key, None)
+            self._stats[engine_id]["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats[engine_id]["hits"] += 1
+        return entry[1]
+
+    def put(self, engine_id: str, key: str, response: str) -> None:
+        if not response:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats[engine_id]["evictions"] += 1
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+
+    def set_guild_enabled(self, guild_id: str, enabled: bool) -> None:
+        if enabled:
+            self.disabled_guilds.discard(guild_id)
+        else:
+            self.disabled_guilds.add(guild_id)
+
+    def engine_stats(self, engine_id: str) -> Dict[str, Any]:
+        stats = dict(self._stats.get(engine_id, {}))
+        lookups = stats.get("hits", 0) + stats.get("misses", 0)
+        stats["hit_rate"] = stats.get("hits", 0) / lookups if lookups else 0.0
+        return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "disabled_guilds": sorted(self.disabled_guilds),
+            "engines": {
+                engine_id: self.engine_stats(engine_id)
+                for engine_id in self._stats
+            },
+        }
+
+
+# Global singleton
+RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,183 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from app.core.config import Config
+
+
+class SchedulerFull(RuntimeError):
+    """
+    Raised when a generation is shed because the queue is full.
+    """
+
+
+def _parse_weights(raw: str) -> Dict[str, float]:
+    weights = {}
+    for item in raw.split(","):
+        if ":" in item:
+            key, value = item.split(":", 1)
+            weights[key.strip()] = float(value)
+    return weights
+
+
+class _EngineQueue:
+    """
+    Admission state for one engine.
+
+    Waiters are ordered by (priority class, virtual finish tag), which
+    gives weighted fair queuing across flows (guilds, or users in DMs).
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.heap: List[Any] = []
+        self.virtual_time = 0.0
+        self.last_finish: Dict[str, float] = defaultdict(float)
+        self.queued_per_user: Dict[str, int] = defaultdict(int)
+
+        self.shed = 0
+        self.admitted = 0
+        self.waits: Deque[float] = deque(maxlen=200)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, w in self.heap if not w["future"].done())
+
+
+class GenerationScheduler:
+    """
+    Admission control in front of engine generations.
+
+    - Per-engine concurrency limit with a bounded wait queue
+    - Weighted fair queuing across guilds, per-user queue caps
+    - Priority class for slash-command interactions
+    - Load shedding via SchedulerFull when the queue is full
+    """
+
+    def __init__(self):
+        self.default_limit = int(Config.get("SCHEDULER_MAX_CONCURRENCY", 2))
+        self.max_queue = int(Config.get("SCHEDULER_MAX_QUEUE", 50))
+        self.max_queued_per_user = int(
+            Config.get("SCHEDULER_MAX_QUEUED_PER_USER", 3)
+        )
+        self.weights = _parse_weights(
+            str(Config.get("SCHEDULER_GUILD_WEIGHTS", ""))
+        )
+
+        self._queues: Dict[str, _EngineQueue] = {}
+        self._seq = itertools.count()
+
+    def _queue(self, engine_id: str) -> _EngineQueue:
+        if engine_id not in self._queues:
+            limit = int(
+                Config.get(
+                    f"SCHEDULER_CONCURRENCY_{engine_id.upper()}",
+                    self.default_limit,
+                )
+            )
+            self._queues[engine_id] = _EngineQueue(limit)
+        return self._queues[engine_id]
+
+    def _dispatch(self, queue: _EngineQueue) -> None:
+        while queue.heap and queue.running < queue.limit:
+            _, tag, _, waiter = heapq.heappop(queue.heap)
+            if waiter["future"].done():
+                continue
+
+            queue.queued_per_user[waiter["user"]] -= 1
+
+            queue.virtual_time = max(queue.virtual_time, tag)
+            queue.running += 1
+            waiter["future"].set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        engine_id: str,
+        guild_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        priority: bool = False,
+    ) -> AsyncIterator[None]:
+        queue = self._queue(engine_id)
+        enqueued = time.perf_counter()
+
+        if queue.running < queue.limit and not queue.heap:
+            queue.running += 1
+        else:
+            user = user_id or "anonymous"
+
+            if (
+                queue.queued >= self.max_queue
+                or queue.queued_per_user[user] >= self.max_queued_per_user
+            ):
+                queue.shed += 1
+                raise SchedulerFull(
+                    f"Generation queue for '{engine_id}' is full"
+                )
+
+            flow = guild_id or f"user:{user}"
+            weight = self.weights.get(guild_id or "", 1.0)
+            tag = max(queue.virtual_time, queue.last_finish[flow]) + 1 / weight
+            queue.last_finish[flow] = tag
+
+            waiter = {
+                "future": asyncio.get_running_loop().create_future(),
+                "user": user,
+            }
+            queue.queued_per_user[user] += 1
+            heapq.heappush(
+                queue.heap,
+                (0 if priority else 1, tag, next(self._seq), waiter),
+            )
+            # Admits immediately if only dead entries were ahead of us
+            self._dispatch(queue)
+
+            try:
+                await waiter["future"]
+            except asyncio.CancelledError:
+                if waiter["future"].cancelled():
+                    # Still queued: dispatch will skip the dead entry
+                    queue.queued_per_user[user] -= 1
+                else:
+                    # Admitted in the same tick we were cancelled: pass it on
+                    queue.running -= 1
+                    self._dispatch(queue)
+                raise
+
+        queue.admitted += 1
+        queue.waits.append(time.perf_counter() - enqueued)
+
+        try:
+            yield
+        finally:
+            queue.running -= 1
+            self._dispatch(queue)
+
+    def load(self, engine_id: str) -> float:
+        """
+        Occupancy relative to the engine's limit: 1.0 means every slot
+        is busy; above 1.0 requests are queuing.
+        """
+        queue = self._queue(engine_id)
+        return (queue.running + queue.queued) / max(queue.limit, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = {}
+        for engine_id, queue in self._queues.items():
+            waits = sorted(queue.waits)
+            data[engine_id] = {
+                "running": queue.running,
+                "limit": queue.limit,
+                "queued": queue.queued,
+                "max_queue": self.max_queue,
+                "admitted": queue.admitted,
+                "shed": queue.shed,
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait": waits[int(len(waits) * 0.95)] if waits else 0.0,
+            }
+        return data
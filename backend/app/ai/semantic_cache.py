@@ -0,0 +1,212 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import Config
+from app.monitoring.logs import log
+from .engine_registry import ENGINE_REGISTRY
+from .single_flight import context_digest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class _Partition:
+    """
+    Fixed-capacity embedding matrix for one partition.
+    Rows are L2-normalized so a dot product is cosine similarity.
+    """
+
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.responses: List[Optional[str]] = [None] * capacity
+        self.count = 0
+
+    def search(self, query) -> Tuple[int, float]:
+        if not self.count:
+            return -1, 0.0
+
+        sims = self.vectors[: self.count] @ query
+        sims[self.expires[: self.count] < time.monotonic()] = -1.0
+        best = int(np.argmax(sims))
+        return best, float(sims[best])
+
+    def insert(self, vector, response: str, ttl: float) -> None:
+        if self.count < len(self.responses):
+            slot = self.count
+            self.count += 1
+        else:
+            # Evict least recently used row in place
+            slot = int(np.argmin(self.last_used))
+
+        now = time.monotonic()
+        self.vectors[slot] = vector
+        self.responses[slot] = response
+        self.last_used[slot] = now
+        self.expires[slot] = now + ttl
+
+
+class SemanticCache:
+    """
+    Paraphrase-tolerant response cache.
+
+    - Prompts are embedded through the Ollama embeddings endpoint
+    - Vectors live in compact float32 matrices partitioned per guild
+      (or DM user), engine and context digest, so replies built on
+      one user's memories are never served to another
+    - At most SEMANTIC_CACHE_PARTITIONS partitions, LRU-evicted
+    - A cached answer is served when cosine similarity >= threshold
+    - Records hit rate, lookup latency and generation time saved
+    """
+
+    def __init__(self):
+        self.enabled = np is not None and str(
+            Config.get("SEMANTIC_CACHE_ENABLED", "false")
+        ).lower() in ("1", "true", "yes")
+        self.threshold = float(Config.get("SEMANTIC_CACHE_THRESHOLD", 0.95))
+        self.capacity = int(Config.get("SEMANTIC_CACHE_SIZE", 512))
+        self.max_partitions = int(
+            Config.get("SEMANTIC_CACHE_PARTITIONS", 64)
+        )
+        self.ttl = float(Config.get("SEMANTIC_CACHE_TTL", 3600))
+        self.embed_engine_id = Config.get(
+            "SEMANTIC_CACHE_EMBED_ENGINE", "ollama"
+        )
+
+        self._partitions: "OrderedDict[Tuple[str, str, str], _Partition]" = (
+            OrderedDict()
+        )
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "lookup_seconds": 0.0,
+            "miss_generation_seconds": 0.0,
+            "stores": 0,
+        }
+
+    async def _embed(self, prompt: str):
+        async with ENGINE_REGISTRY.lease(self.embed_engine_id) as engine:
+            if engine is None or not hasattr(engine, "embed"):
+                return None
+
+            embeddings = await engine.embed([" ".join(prompt.split())])
+        if not embeddings:
+            return None
+
+        vector = np.asarray(embeddings[0], dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    @staticmethod
+    def partition_key(
+        guild_id: Optional[str],
+        user_id: Optional[str],
+        engine_id: str,
+        context: Dict[str, Any],
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        None when the request has no owner to partition by.
+        """
+        if guild_id:
+            owner = guild_id
+        elif user_id:
+            owner = f"dm:{user_id}"
+        else:
+            return None
+        return owner, engine_id, context_digest(context)
+
+    async def lookup(
+        self,
+        key: Tuple[str, str, str],
+        prompt: str,
+    ) -> Tuple[Any, Optional[str]]:
+        """
+        Returns (query vector, cached response or None).
+        The vector is passed back to store() on a miss.
+        """
+        start = time.perf_counter()
+
+        try:
+            vector = await self._embed(prompt)
+        except Exception as e:
+            await log(f"Semantic cache embedding failed: {e}")
+            return None, None
+
+        if vector is None:
+            return None, None
+
+        response = None
+        partition = self._partitions.get(key)
+        if partition is not None and partition.vectors.shape[1] == len(vector):
+            self._partitions.move_to_end(key)
+            slot, score = partition.search(vector)
+            if slot >= 0 and score >= self.threshold:
+                partition.last_used[slot] = time.monotonic()
+                response = partition.responses[slot]
+
+        self.stats["lookups"] += 1
+        self.stats["lookup_seconds"] += time.perf_counter() - start
+        if response is not None:
+            self.stats["hits"] += 1
+
+        return vector, response
+
+    def store(
+        self,
+        key: Optional[Tuple[str, str, str]],
+        vector,
+        response: str,
+        generation_seconds: float,
+    ) -> None:
+        if key is None or vector is None or not response:
+            return
+
+        partition = self._partitions.get(key)
+        if partition is None or partition.vectors.shape[1] != len(vector):
+            partition = _Partition(self.capacity, len(vector))
+            self._partitions[key] = partition
+        self._partitions.move_to_end(key)
+
+        while len(self._partitions) > self.max_partitions:
+            self._partitions.popitem(last=False)
+
+        partition.insert(vector, response, self.ttl)
+        self.stats["stores"] += 1
+        self.stats["miss_generation_seconds"] += generation_seconds
+
+    def invalidate(self) -> None:
+        self._partitions.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.stats["lookups"]
+        hits = self.stats["hits"]
+        stores = self.stats["stores"]
+
+        avg_lookup = self.stats["lookup_seconds"] / lookups if lookups else 0.0
+        avg_generation = (
+            self.stats["miss_generation_seconds"] / stores if stores else 0.0
+        )
+
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "partitions": len(self._partitions),
+            "entries": sum(p.count for p in self._partitions.values()),
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "avg_lookup_latency": avg_lookup,
+            "avg_miss_generation": avg_generation,
+            # Each hit skips one generation but every lookup pays an embed
+            "estimated_seconds_saved": (
+                hits * avg_generation - lookups * avg_lookup
+            ),
+        }
+
+
+# Global singleton
+SEMANTIC_CACHE = SemanticCache()
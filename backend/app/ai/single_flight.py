@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import Config
+
+
+_END = object()
+
+
+def context_digest(context: Dict[str, Any]) -> str:
+    """
+    Stable digest of a rendered context (order-independent).
+    """
+    raw = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.split()).casefold()
+
+
+def flight_key(engine_id: str, prompt: str, context: Dict[str, Any]) -> str:
+    return f"{engine_id}:{normalize_prompt(prompt)}:{context_digest(context)}"
+
+
+class _StreamFlight:
+    """
+    One in-flight stream fanned out to every subscriber.
+    Late joiners replay the tokens produced so far.
+    """
+
+    def __init__(self):
+        self.tokens: List[str] = []
+        self.queues: List[asyncio.Queue] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for token in source:
+                self.tokens.append(token)
+                for q in self.queues:
+                    q.put_nowait(token)
+        except asyncio.CancelledError:
+            # Anyone still reading must not take a cut-off reply as whole
+            self.error = RuntimeError("Shared generation was cancelled")
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            for q in self.queues:
+                q.put_nowait(_END)
+
+    def subscribe(self) -> asyncio.Queue:
+        q: asyncio.Queue = asyncio.Queue()
+        for token in self.tokens:
+            q.put_nowait(token)
+        if self.done:
+            q.put_nowait(_END)
+        else:
+            self.queues.append(q)
+        return q
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical generations.
+
+    - Callers with the same key share one in-flight request
+    - A caller cancelling never cancels the shared request for others
+    - Streams are fanned out so every caller sees every token
+    """
+
+    def __init__(self):
+        self.enabled = str(
+            Config.get("ROUTER_SINGLE_FLIGHT", "true")
+        ).lower() in ("1", "true", "yes")
+
+        self._calls: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _StreamFlight] = {}
+        self.counters = {"leaders": 0, "shared": 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[str]]) -> str:
+        task = self._calls.get(key)
+
+        if task is None:
+            self.counters["leaders"] += 1
+            task = asyncio.create_task(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.counters["shared"] += 1
+
+        return await asyncio.shield(task)
+
+    async def stream(
+        self,
+        key: str,
+        fn: Callable[[], AsyncIterator[str]],
+    ) -> AsyncIterator[str]:
+        flight = self._streams.get(key)
+
+        if flight is None:
+            self.counters["leaders"] += 1
+            flight = _StreamFlight()
+            self._streams[key] = flight
+            flight.task = asyncio.create_task(flight.pump(fn()))
+            flight.task.add_done_callback(
+                lambda _: self._forget(key, flight)
+            )
+        else:
+            self.counters["shared"] += 1
+
+        q = flight.subscribe()
+        try:
+            while True:
+                item = await q.get()
+                if item is _END:
+                    if flight.error:
+                        raise flight.error
+                    return
+                yield item
+        finally:
+            if q in flight.queues:
+                flight.queues.remove(q)
+            # Last subscriber gone: nobody needs the generation anymore.
+            # Unlisted first, so no caller joins a flight being cancelled.
+            if not flight.queues and not flight.done:
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _StreamFlight) -> None:
+        if self._streams.get(key) is flight:
+            del self._streams[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls) + len(self._streams),
+            **self.counters,
+        }
@@ -1,37 +1,59 @@
 import asyncio
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 from collections import defaultdict
 
 
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
 class StateManager:
     """
     Central async-safe state isolation manager.
     Prevents cross-contamination between engines, plugins, servers.
+
+    - Each namespace is an immutable snapshot; reads never lock
+    - Writes copy the namespace, apply the change and publish the copy
+      (copy-on-write), serialized per namespace, not globally
     """
 
     def __init__(self):
-        self._lock = asyncio.Lock()
-        self._state: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._state: Dict[str, Mapping[str, Any]] = {}
+
+    def _view(self, namespace: str) -> Mapping[str, Any]:
+        return self._state.get(namespace, _EMPTY)
 
     async def get(self, namespace: str, key: str, default: Any = None) -> Any:
-        async with self._lock:
-            return self._state[namespace].get(key, default)
+        return self._view(namespace).get(key, default)
 
     async def set(self, namespace: str, key: str, value: Any) -> None:
-        async with self._lock:
-            self._state[namespace][key] = value
+        async with self._locks[namespace]:
+            self._state[namespace] = MappingProxyType(
+                {**self._view(namespace), key: value}
+            )
 
     async def delete(self, namespace: str, key: str) -> None:
-        async with self._lock:
-            self._state[namespace].pop(key, None)
+        async with self._locks[namespace]:
+            current = self._view(namespace)
+            if key in current:
+                values = dict(current)
+                del values[key]
+                self._state[namespace] = MappingProxyType(values)
 
     async def clear_namespace(self, namespace: str) -> None:
-        async with self._lock:
+        async with self._locks[namespace]:
             self._state.pop(namespace, None)
 
     async def snapshot(self, namespace: str) -> Dict[str, Any]:
-        async with self._lock:
-            return dict(self._state.get(namespace, {}))
+        return dict(self._view(namespace))
+
+    def view(self, namespace: str) -> Mapping[str, Any]:
+        """
+        Read-only view of a namespace, without copying.
+        Stays consistent: later writes publish a new view.
+        """
+        return self._view(namespace)
 
 
 # Global singleton (intentional)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import APIRouter
 
 from app.core.config import Config
@@ -5,10 +7,13 @@ from app.core.event_bus import EVENT_BUS
 
 from app.ai.engine_registry import ENGINE_REGISTRY
 from app.ai.engine_router import ENGINE_ROUTER
-from app.ai.engines.cloud import register_cloud_engines
+from app.ai.response_cache import RESPONSE_CACHE
+from app.ai.semantic_cache import SEMANTIC_CACHE
+from app.ai.engines.cloud import register_cloud_engine, register_cloud_engines
 
 from app.plugins import PLUGIN_MANAGER
 from app.cognition import Personality, MoodEngine
+from app.memory import MEMORY
 from app.monitoring import log
 
 # OPTIONAL: enable if you want admin auth enforced
@@ -34,23 +39,30 @@ async def cloud_status():
 @router.post("/cloud/toggle/{engine}")
 async def toggle_cloud(engine: str, enabled: bool):
     if not enabled:
+        # In-flight requests finish on the old instance
         await ENGINE_REGISTRY.unregister(engine)
-        log(f"Cloud engine disabled: {engine}")
+        await log(f"Cloud engine disabled: {engine}")
         return {"status": "disabled", "engine": engine}
 
-    # Reload env + re-register cloud engines
+    # Reload env + re-register only this engine
     Config.reload()
-    register_cloud_engines()  # sync
-    log(f"Cloud engine enabled: {engine}")
+    try:
+        registered = await register_cloud_engine(engine)
+    except ValueError as e:
+        return {"status": "error", "detail": str(e)}
+
+    if not registered:
+        return {"status": "error", "detail": f"{engine} could not be enabled"}
 
+    await log(f"Cloud engine enabled: {engine}")
     return {"status": "enabled", "engine": engine}
 
 
 @router.post("/cloud/reload")
 async def reload_cloud_engines():
     Config.reload()
-    register_cloud_engines()  # sync
-    log("Cloud engines reloaded from .env")
+    await register_cloud_engines()
+    await log("Cloud engines reloaded from .env")
     return {"status": "reloaded"}
 
 
@@ -65,9 +77,134 @@ async def list_ai_engines():
 
 
 @router.post("/ai/engine/active")
-async def set_active_engine(engine_id: str):
-    await ENGINE_ROUTER.set_active(engine_id)
-    return {"status": "ok", "active": engine_id}
+async def set_active_engine(
+    engine_id: Optional[str] = None,
+    mode: Optional[str] = None,
+):
+    """
+    mode=fixed: route to engine_id (then the fallback).
+    mode=adaptive: pick per request; engine_id, if given, stays the
+    default used when no engine can be scored.
+    Without mode, the current routing mode is kept.
+    """
+    if mode is None and not engine_id:
+        return {"status": "error", "detail": "engine_id or mode required"}
+
+    if mode == "fixed" and not engine_id and not ENGINE_ROUTER.active_engine_id:
+        return {"status": "error", "detail": "engine_id required in fixed mode"}
+
+    try:
+        if engine_id:
+            await ENGINE_ROUTER.set_active(engine_id)
+        if mode is not None:
+            await ENGINE_ROUTER.set_mode(mode)
+    except ValueError as e:
+        return {"status": "error", "detail": str(e)}
+
+    return {
+        "status": "ok",
+        "mode": ENGINE_ROUTER.mode,
+        "active": ENGINE_ROUTER.active_engine_id,
+    }
+
+
+@router.get("/ai/registry")
+async def registry_stats():
+    """
+    Engine versions, in-flight leases, draining instances
+    and recent hot-swap timings.
+    """
+    return ENGINE_REGISTRY.snapshot()
+
+
+@router.get("/ai/routing")
+async def routing_stats():
+    return ENGINE_ROUTER.selector.snapshot()
+
+
+@router.post("/ai/routing/pin")
+async def pin_engine(
+    engine_id: Optional[str] = None,
+    guild_id: Optional[str] = None,
+):
+    """
+    Pin a guild (or all traffic, without guild_id) to an engine in
+    adaptive mode; omit engine_id to remove the pin.
+    """
+    ENGINE_ROUTER.pin(engine_id, guild_id)
+    return {"status": "ok", "pins": ENGINE_ROUTER.selector.snapshot()["pins"]}
+
+
+@router.post("/ai/ollama/model")
+async def set_ollama_model(model: str):
+    engine = await ENGINE_REGISTRY.get("ollama")
+    if not engine:
+        return {"status": "error", "detail": "ollama engine not registered"}
+
+    await engine.set_model(model)
+    await log(f"Ollama model switched to: {model}")
+    return {"status": "ok", "model": model}
+
+
+@router.post("/ai/ollama/tier")
+async def set_ollama_tier(mode: str = "auto"):
+    """
+    Tier override: auto (classify each message), simple or complex.
+    """
+    engine = await ENGINE_REGISTRY.get("ollama")
+    if not engine:
+        return {"status": "error", "detail": "ollama engine not registered"}
+
+    try:
+        engine.tiering.set_mode(mode)
+    except ValueError as e:
+        return {"status": "error", "detail": str(e)}
+
+    await log(f"Ollama tier mode set to: {mode}")
+    return {"status": "ok", "tiering": engine.tiering.snapshot()}
+
+
+@router.get("/ai/breakers")
+async def list_engine_breakers():
+    return ENGINE_ROUTER.breakers()
+
+
+@router.get("/ai/hedging")
+async def hedging_stats():
+    return ENGINE_ROUTER.hedging.snapshot()
+
+
+@router.get("/ai/single-flight")
+async def single_flight_stats():
+    return ENGINE_ROUTER.single_flight.snapshot()
+
+
+@router.get("/ai/scheduler")
+async def scheduler_stats():
+    return ENGINE_ROUTER.scheduler.snapshot()
+
+
+@router.get("/ai/cache")
+async def response_cache_stats():
+    return RESPONSE_CACHE.snapshot()
+
+
+@router.get("/ai/cache/semantic")
+async def semantic_cache_stats():
+    return SEMANTIC_CACHE.snapshot()
+
+
+@router.post("/ai/cache/clear")
+async def clear_response_cache():
+    RESPONSE_CACHE.invalidate()
+    SEMANTIC_CACHE.invalidate()
+    return {"status": "cleared"}
+
+
+@router.post("/ai/cache/guild/{guild_id}")
+async def toggle_guild_cache(guild_id: str, enabled: bool):
+    RESPONSE_CACHE.set_guild_enabled(guild_id, enabled)
+    return {"status": "ok", "guild": guild_id, "enabled": enabled}
 
 
 # ==================================================
@@ -110,6 +247,8 @@ async def get_cognition_state():
 @router.post("/cognition/personality")
 async def update_personality(traits: dict):
     PERSONALITY.update(traits)
+    RESPONSE_CACHE.invalidate()
+    SEMANTIC_CACHE.invalidate()
     await EVENT_BUS.emit(
         "cognition.personality.updated",
         traits=traits,
@@ -127,6 +266,36 @@ async def override_mood(mood: str):
     return {"status": "updated", "mood": mood}
 
 
+# ==================================================
+# MEMORY
+# ==================================================
+
+@router.get("/memory/{scope}/{owner_id}")
+async def browse_memory(
+    scope: str,
+    owner_id: str,
+    limit: int = 20,
+    before: Optional[int] = None,
+):
+    """
+    Newest-first page of a user's or server's memories.
+    Pass the returned "next" as `before` to get the following page.
+    """
+    stores = {"user": MEMORY.user, "server": MEMORY.server}
+    if scope not in stores:
+        return {"status": "error", "detail": f"Unknown memory scope '{scope}'"}
+
+    return await stores[scope].page(owner_id, min(limit, 100), before)
+
+
+@router.post("/memory/compact")
+async def compact_memory():
+    """
+    Run memory compaction now instead of waiting for the next interval.
+    """
+    return await MEMORY_COMPACTOR.compact()
+
+
 # ==================================================
 # MONITORING
 # ==================================================
@@ -137,6 +306,10 @@ from app.monitoring import (
     get_logs,
     health_check,
 )
+from app.utils.async_tools import BLOCKING_EXECUTOR
+from app.memory.database import MEMORY_DB
+from app.memory.write_behind import MEMORY_WRITES
+from app.memory.compaction import MEMORY_COMPACTOR
 
 
 @router.get("/monitoring/hardware")
@@ -150,8 +323,23 @@ async def monitoring_metrics():
 
 
 @router.get("/monitoring/health")
-async def monitoring_health():
-    return await health_check()
+async def monitoring_health(refresh: bool = False):
+    return await health_check(refresh=refresh)
+
+
+@router.get("/monitoring/executor")
+async def monitoring_executor():
+    return BLOCKING_EXECUTOR.snapshot()
+
+
+@router.get("/monitoring/memory")
+async def monitoring_memory():
+    return {
+        "database": MEMORY_DB.snapshot(),
+        "writes": MEMORY_WRITES.snapshot(),
+        "compaction": MEMORY_COMPACTOR.snapshot(),
+        "vectors": MEMORY.vectors.snapshot(),
+    }
 
 
 @router.get("/monitoring/logs")
@@ -5,6 +5,7 @@ import asyncio
 from app.core.event_bus import EVENT_BUS
 from app.ai.engine_router import ENGINE_ROUTER
 from app.ai.engine_registry import ENGINE_REGISTRY
+from app.memory.compaction import MEMORY_COMPACTOR
 from app.plugins import PLUGIN_MANAGER
 from app.cognition import Personality, MoodEngine
 from app.monitoring import (
@@ -45,10 +46,19 @@ async def broadcast(payload: dict):
 # EVENT LISTENERS
 # ==================================================
 
-async def engine_switch_listener(engine_id: str):
+async def engine_switch_listener(engine_id: str, mode: str = "fixed"):
     await broadcast({
         "type": "engine.switch",
         "engine": engine_id,
+        "mode": mode,
+    })
+
+
+async def engine_breaker_listener(engine_id: str, state: str):
+    await broadcast({
+        "type": "engine.breaker",
+        "engine": engine_id,
+        "state": state,
     })
 
 
@@ -90,6 +100,7 @@ async def start_dashboard_ws():
     Registers EventBus listeners safely.
     """
     await EVENT_BUS.subscribe("engine.switched", engine_switch_listener)
+    await EVENT_BUS.subscribe("engine.breaker", engine_breaker_listener)
     await EVENT_BUS.subscribe("cognition.personality.updated", personality_listener)
     await EVENT_BUS.subscribe("cognition.mood.updated", mood_listener)
     await EVENT_BUS.subscribe("plugin.loaded", plugin_loaded_listener)
@@ -112,7 +123,8 @@ async def websocket_endpoint(ws: WebSocket):
     await ws.send_json({
         "type": "init",
         "state": {
-            "active_engine": ENGINE_ROUTER._active_engine_id,
+            "active_engine": ENGINE_ROUTER.active_engine_id,
+            "routing_mode": ENGINE_ROUTER.mode,
             "engines": list(engines.keys()),
             "cloud": {
                 "openai": "openai" in engines,
@@ -123,6 +135,9 @@ async def websocket_endpoint(ws: WebSocket):
             "mood": MOOD.snapshot(),
             "hardware": get_hardware_stats(),
             "metrics": await collect_engine_metrics(),
+            "breakers": ENGINE_ROUTER.breakers(),
+            "scheduler": ENGINE_ROUTER.scheduler.snapshot(),
+            "compaction": MEMORY_COMPACTOR.snapshot(),
             "logs": get_logs(),
         },
     })
@@ -134,6 +149,9 @@ async def websocket_endpoint(ws: WebSocket):
                 "type": "monitoring.update",
                 "hardware": get_hardware_stats(),
                 "metrics": await collect_engine_metrics(),
+                "breakers": ENGINE_ROUTER.breakers(),
+                "scheduler": ENGINE_ROUTER.scheduler.snapshot(),
+                "compaction": MEMORY_COMPACTOR.snapshot(),
                 "logs": get_logs(),
             })
     except WebSocketDisconnect:
@@ -3,6 +3,7 @@ import discord
 from discord.ext import commands
 
 from app.ai.engine_router import ENGINE_ROUTER
+from app.ai.scheduler import SchedulerFull
 from app.ai.context_manager import ContextManager
 from app.cognition import (
     Personality,
@@ -14,6 +15,7 @@ from app.cognition import (
 from app.memory import MEMORY
 from app.core.config import Config
 from app.monitoring import log
+from .streaming import StreamingReply
 
 
 class DiscordBot(commands.Bot):
@@ -56,7 +58,6 @@ class DiscordBot(commands.Bot):
         # ==================================================
         # COGNITION COMPONENTS
         # ==================================================
-        self.context_manager = ContextManager(MEMORY)
         self.personality = Personality()
         self.mood = MoodEngine()
         self.emotion = EmotionModel()
@@ -83,29 +84,37 @@ class DiscordBot(commands.Bot):
 
         try:
             # ---- Emotion + mood ----
-            emotions = self.emotion.analyze(message.content)
-            self.mood.update(emotions)
+            emotions = self.emotion.infer(message.content)
+            dominant = max(emotions, key=emotions.get, default=None)
+            if dominant and emotions[dominant] > 0:
+                self.mood.update_from_emotion(dominant, emotions[dominant])
 
             # ---- Context ----
-            context = self.context_manager.build_context(
-                user_id=str(message.author.id),
-                content=message.content,
-            )
-
-            # ---- AI generation ----
-            response = await ENGINE_ROUTER.generate(
-                prompt=message.content,
-                context=context,
-                mood=self.mood.current,
-                personality=self.personality.current,
+            context = ContextManager.build(
+                memory=await MEMORY.recall_context(
+                    message.content,
+                    str(message.author.id),
+                    str(message.guild.id) if message.guild else None,
+                ),
+                personality=self.personality.snapshot(),
+                mood=self.mood.snapshot(),
+                engine_id=ENGINE_ROUTER.active_engine_id,
+                conversation=f"{message.channel.id}:{message.author.id}",
             )
 
-            # ---- Expression ----
+            # ---- AI generation (streamed) ----
             emoji = self.expression.emoji_for_mood(self.mood.current)
-            final = f"{response} {emoji}".strip()
-
-            for chunk in self.expression.split_message(final):
-                await message.reply(chunk)
+            reply = StreamingReply(message.reply, self.expression)
+
+            await reply.consume(
+                ENGINE_ROUTER.stream(
+                    prompt=message.content,
+                    context=context,
+                    guild_id=str(message.guild.id) if message.guild else None,
+                    user_id=str(message.author.id),
+                ),
+                suffix=emoji,
+            )
 
             # ---- Reflection ----
             await self.reflection.reflect(
@@ -114,6 +123,15 @@ class DiscordBot(commands.Bot):
                 emotion_scores=emotions,
             )
 
+        except SchedulerFull:
+            await log(f"Generation shed for user {message.author.id}: queue full")
+            await message.reply(
+                Config.get(
+                    "SCHEDULER_BUSY_MESSAGE",
+                    "I'm a little overwhelmed right now, try again in a moment!",
+                )
+            )
+
         except Exception as e:
             log(f"Failed to generate response for user {message.author.id}: {e}")
 
@@ -1,6 +1,7 @@
 import discord
 from discord import app_commands
 from app.ai.engine_router import ENGINE_ROUTER
+from app.ai.scheduler import SchedulerFull
 from app.ai.context_manager import ContextManager
 from app.cognition import (
     Personality,
@@ -9,6 +10,8 @@ from app.cognition import (
     ExpressionEngine,
 )
 from app.memory import MEMORY
+from app.core.config import Config
+from app.discord.streaming import StreamingReply
 
 
 class ChatCommand(app_commands.CommandTree):
@@ -23,17 +26,36 @@ async def chat(interaction: discord.Interaction, message: str):
     emotions = EmotionModel().infer(message)
 
     context = ContextManager.build(
-        memory={
-            "user": await MEMORY.user.fetch(str(interaction.user.id)),
-            "server": await MEMORY.server.fetch(str(interaction.guild.id)),
-        },
+        memory=await MEMORY.recall_context(
+            message,
+            str(interaction.user.id),
+            str(interaction.guild.id),
+        ),
         personality=Personality().snapshot(),
         mood=MoodEngine().snapshot(),
+        engine_id=ENGINE_ROUTER.active_engine_id,
+        conversation=f"{interaction.channel_id}:{interaction.user.id}",
     )
 
-    response = await ENGINE_ROUTER.generate(
-        prompt=message,
-        context=context,
-    )
-
-    await interaction.followup.send(response)
+    async def send(content: str):
+        return await interaction.followup.send(content, wait=True)
+
+    reply = StreamingReply(send, ExpressionEngine())
+    try:
+        # Slash commands have an interaction deadline: queue ahead of chatter
+        await reply.consume(
+            ENGINE_ROUTER.stream(
+                prompt=message,
+                context=context,
+                guild_id=str(interaction.guild.id),
+                user_id=str(interaction.user.id),
+                priority=True,
+            )
+        )
+    except SchedulerFull:
+        await interaction.followup.send(
+            Config.get(
+                "SCHEDULER_BUSY_MESSAGE",
+                "I'm a little overwhelmed right now, try again in a moment!",
+            )
+        )
@@ -0,0 +1,68 @@
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, List
+
+from app.cognition import ExpressionEngine
+from app.core.config import Config
+
+
+class StreamingReply:
+    """
+    Progressively renders a token stream into Discord messages.
+
+    - Edits are throttled to stay inside Discord's rate limits
+    - Text is split with ExpressionEngine.split_message; once a chunk
+      is full it is frozen and a new message is started for the rest
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[Any]],
+        expression: ExpressionEngine,
+        interval: float | None = None,
+    ):
+        self.send = send
+        self.expression = expression
+        self.interval = (
+            interval
+            if interval is not None
+            else float(Config.get("DISCORD_STREAM_EDIT_INTERVAL", 1.0))
+        )
+
+        self._messages: List[Any] = []
+        self._rendered: List[str] = []
+        self._last_render = 0.0
+
+    async def _render(self, text: str) -> None:
+        if not text.strip():
+            return
+
+        for i, chunk in enumerate(self.expression.split_message(text)):
+            if i < len(self._messages):
+                if self._rendered[i] != chunk:
+                    await self._messages[i].edit(content=chunk)
+                    self._rendered[i] = chunk
+            else:
+                self._messages.append(await self.send(chunk))
+                self._rendered.append(chunk)
+
+        self._last_render = time.monotonic()
+
+    async def consume(
+        self,
+        tokens: AsyncIterator[str],
+        suffix: str = "",
+    ) -> str:
+        """
+        Render tokens as they arrive, then the final text + suffix.
+        Returns the final rendered text.
+        """
+        text = ""
+
+        async for token in tokens:
+            text += token
+            if time.monotonic() - self._last_render >= self.interval:
+                await self._render(text)
+
+        final = f"{text.strip()} {suffix}".strip()
+        await self._render(final)
+        return final
@@ -0,0 +1,328 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import Config
+from app.monitoring.logs import log
+from .database import MEMORY_DB, MemoryDatabase
+
+
+# (table, owner column, value column, cap ordering, cap setting, default cap)
+_TABLES = (
+    ("user_memory", "user_id", "importance", "rank_key",
+     "MEMORY_MAX_PER_USER", 1000),
+    ("server_memory", "server_id", "importance", "rank_key",
+     "MEMORY_MAX_PER_SERVER", 5000),
+    ("emotional_memory", "user_id", "intensity", "created_at",
+     "MEMORY_MAX_EMOTIONS_PER_USER", 500),
+)
+
+# Tables whose rows are embedded into vector_memory (by source key)
+_VECTOR_SOURCES = ("user_memory", "server_memory")
+
+
+class MemoryCompactor:
+    """
+    Background memory compaction and pruning.
+
+    - Opt-in: runs every MEMORY_COMPACT_INTERVAL seconds when > 0
+      (default 0, off); the dashboard can still run it on demand
+    - Scans each memory table in id-ordered batches and computes
+      decayed importance with NumPy
+    - Rows below MEMORY_DECAY_FLOOR are moved to <table>_archive
+      (MEMORY_ARCHIVE, default on), or deleted when it is off
+    - Effective retention: half_life * log2(importance / floor); with
+      the defaults (1 day, 0.01) that is ~3.3 days at importance 0.1
+      up to ~6.6 days at 1.0 (see retention())
+    - Per-user / per-server row caps keep the best-ranked rows
+    - Removed memories take their vector_memory rows with them, so
+      semantic recall never returns them; the owners' vector files are
+      then rewritten without the dead vectors
+    - Free pages are returned with incremental vacuum, a few pages per
+      slice, yielding between slices
+    - The writer lock is held per batch, never for a whole run
+    """
+
+    def __init__(self, db: MemoryDatabase = MEMORY_DB):
+        self.db = db
+        self.interval = float(Config.get("MEMORY_COMPACT_INTERVAL", 0))
+        self.enabled = self.interval > 0
+        self.batch = int(Config.get("MEMORY_COMPACT_BATCH", 2000))
+        self.floor = float(Config.get("MEMORY_DECAY_FLOOR", 0.01))
+        self.half_life = float(Config.get("MEMORY_HALF_LIFE", 86400))
+        self.archive = str(
+            Config.get("MEMORY_ARCHIVE", "true")
+        ).lower() in ("1", "true", "yes")
+        self.vacuum_pages = int(Config.get("MEMORY_VACUUM_PAGES", 256))
+        self.vacuum_pause = float(Config.get("MEMORY_VACUUM_PAUSE", 0.05))
+        self.caps = {
+            table: int(Config.get(setting, default))
+            for table, _, _, _, setting, default in _TABLES
+        }
+
+        # VectorMemoryStore, set by MemoryManager
+        self.vectors = None
+        # (model, scope, owner) vector files that lost rows this run
+        self._stale: Set[Tuple[str, str, str]] = set()
+
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
+
+        self.runs = 0
+        self.totals = {
+            "decayed": 0,
+            "capped": 0,
+            "bytes_reclaimed": 0,
+            "vector_bytes_reclaimed": 0,
+        }
+        self.last: Optional[Dict[str, Any]] = None
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+    def retention(self, importance: float) -> Optional[float]:
+        """
+        Age in seconds at which a row of this importance is pruned
+        (None: never, decay pruning is off).
+        """
+        if self.floor <= 0:
+            return None
+        if importance <= self.floor:
+            return 0.0
+        return self.half_life * math.log2(importance / self.floor)
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.compact()
+            except Exception as e:
+                await log(f"Memory compaction failed: {e}")
+
+    async def _remove(self, table: str, ids: List[int]) -> int:
+        if not ids:
+            return 0
+
+        marks = ",".join("?" * len(ids))
+        async with self.db.write() as db:
+            if self.archive:
+                await db.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table}_archive "
+                    f"AS SELECT * FROM {table} WHERE 0"
+                )
+                await db.execute(
+                    f"INSERT INTO {table}_archive "
+                    f"SELECT * FROM {table} WHERE id IN ({marks})",
+                    ids,
+                )
+            if table in _VECTOR_SOURCES:
+                where = (
+                    "source IN "
+                    f"(SELECT source FROM {table} WHERE id IN ({marks}))"
+                )
+                cursor = await db.execute(
+                    "SELECT DISTINCT model, scope, owner FROM vector_memory "
+                    f"WHERE {where}",
+                    ids,
+                )
+                self._stale.update(
+                    tuple(row) for row in await cursor.fetchall()
+                )
+                await db.execute(
+                    f"DELETE FROM vector_memory WHERE {where}", ids
+                )
+            cursor = await db.execute(
+                f"DELETE FROM {table} WHERE id IN ({marks})", ids
+            )
+            return cursor.rowcount
+
+    async def _prune_decayed(self, table: str, value_column: str) -> int:
+        """
+        Remove rows whose decayed value fell under the floor,
+        one id range at a time.
+        """
+        pruned, last_id = 0, 0
+        while True:
+            async with self.db.read() as db:
+                cursor = await db.execute(
+                    f"SELECT id, {value_column}, created_at FROM {table} "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, self.batch),
+                )
+                rows = await cursor.fetchall()
+            if not rows:
+                return pruned
+
+            data = np.array(rows, dtype=np.float64)
+            last_id = int(data[-1, 0])
+
+            # MemoryDecay.apply, vectorized (NULL values count as 0)
+            value = np.nan_to_num(data[:, 1])
+            age = time.time() - np.nan_to_num(data[:, 2])
+            decayed = value * np.power(0.5, age / self.half_life)
+
+            ids = data[decayed < self.floor, 0].astype(np.int64).tolist()
+            pruned += await self._remove(table, ids)
+            await asyncio.sleep(0)
+
+    async def _enforce_cap(
+        self,
+        table: str,
+        owner_column: str,
+        order_column: str,
+    ) -> int:
+        cap = self.caps[table]
+        if cap <= 0:
+            return 0
+
+        async with self.db.read() as db:
+            cursor = await db.execute(
+                f"SELECT {owner_column} FROM {table} "
+                f"GROUP BY {owner_column} HAVING COUNT(*) > ?",
+                (cap,),
+            )
+            owners = [row[0] for row in await cursor.fetchall()]
+
+        capped = 0
+        for owner in owners:
+            async with self.db.read() as db:
+                cursor = await db.execute(
+                    f"SELECT id FROM {table} WHERE {owner_column} = ? "
+                    f"ORDER BY {order_column} DESC LIMIT -1 OFFSET ?",
+                    (owner, cap),
+                )
+                ids = [row[0] for row in await cursor.fetchall()]
+
+            for i in range(0, len(ids), self.batch):
+                capped += await self._remove(table, ids[i:i + self.batch])
+                await asyncio.sleep(0)
+
+        return capped
+
+    async def _pragma_value(self, pragma: str) -> int:
+        async with self.db.read() as db:
+            async with db.execute(f"PRAGMA {pragma}") as cursor:
+                row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def _vacuum(self) -> int:
+        """
+        Incremental vacuum in short slices. Returns bytes reclaimed.
+        """
+        if await self._pragma_value("auto_vacuum") != 2:
+            # Only databases created with auto_vacuum=INCREMENTAL
+            return 0
+
+        page_size = await self._pragma_value("page_size")
+        before = await self._pragma_value("page_count")
+
+        # Bounded by the pages free now; rows freed meanwhile wait a run
+        free = await self._pragma_value("freelist_count")
+        for _ in range(-(-free // max(1, self.vacuum_pages))):
+            async with self.db.write() as db:
+                # sqlite3's execute() steps this pragma once (one page);
+                # executescript runs it to completion
+                await db.executescript(
+                    f"PRAGMA incremental_vacuum({self.vacuum_pages});"
+                )
+            await asyncio.sleep(self.vacuum_pause)
+
+        return (before - await self._pragma_value("page_count")) * page_size
+
+    async def _rewrite_vectors(self) -> int:
+        """
+        Drop removed memories' vectors from their owners' files.
+        """
+        stale, self._stale = self._stale, set()
+        if self.vectors is None:
+            return 0
+
+        reclaimed = 0
+        for model, scope, owner in stale:
+            try:
+                reclaimed += await self.vectors.rewrite(model, scope, owner)
+            except Exception as e:
+                await log(
+                    f"Vector file rewrite failed for {scope}:{owner}: {e}"
+                )
+        return reclaimed
+
+    async def compact(self) -> Dict[str, Any]:
+        """
+        One full compaction run (also callable on demand).
+        """
+        async with self._run_lock:
+            start = time.perf_counter()
+            tables: Dict[str, Dict[str, int]] = {}
+
+            for table, owner, value, order, _, _ in _TABLES:
+                tables[table] = {
+                    "decayed": await self._prune_decayed(table, value),
+                    "capped": await self._enforce_cap(table, owner, order),
+                }
+
+            result = {
+                "tables": tables,
+                "decayed": sum(t["decayed"] for t in tables.values()),
+                "capped": sum(t["capped"] for t in tables.values()),
+                "archived": self.archive,
+                "vector_bytes_reclaimed": await self._rewrite_vectors(),
+                "bytes_reclaimed": await self._vacuum(),
+                "seconds": time.perf_counter() - start,
+                "ts": time.time(),
+            }
+
+            self.runs += 1
+            for key in self.totals:
+                self.totals[key] += result[key]
+            self.last = result
+            self.history.append(result)
+
+        await log(
+            f"Memory compaction: {result['decayed']} decayed, "
+            f"{result['capped']} over cap, "
+            f"{result['bytes_reclaimed']} bytes reclaimed "
+            f"(+{result['vector_bytes_reclaimed']} from vector files) "
+            f"in {result['seconds']:.2f}s"
+        )
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            # ImportanceScorer range
+            "retention": {
+                "min_importance": self.retention(0.1),
+                "max_importance": self.retention(1.0),
+            },
+            "floor": self.floor,
+            "caps": self.caps,
+            "archive": self.archive,
+            "running": self._run_lock.locked(),
+            "runs": self.runs,
+            "totals": self.totals,
+            "last": self.last,
+            "history": list(self.history),
+        }
+
+
+# Global singleton
+MEMORY_COMPACTOR = MemoryCompactor()
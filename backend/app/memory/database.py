@@ -0,0 +1,177 @@
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiosqlite
+
+from app.core.config import Config
+from .decay import MemoryDecay
+
+
+class MemoryDatabase:
+    """
+    Shared SQLite connections for every persistent memory store.
+
+    - One writer connection (writes are serialized) plus a small pool of
+      read-only connections, all opened once and kept for the process
+    - WAL journal: readers never block the writer or each other
+    - Tuned pragmas (MEMORY_DB_SYNCHRONOUS / _CACHE_KB / _MMAP_MB)
+    - Compiled statements are reused through each connection's
+      statement cache (MEMORY_DB_STATEMENT_CACHE)
+    - close() checkpoints the WAL and closes everything
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.get("MEMORY_DB_PATH", "data/memory.db")
+        self.readers = int(Config.get("MEMORY_DB_READERS", 4))
+        self.synchronous = Config.get("MEMORY_DB_SYNCHRONOUS", "NORMAL")
+        self.cache_kb = int(Config.get("MEMORY_DB_CACHE_KB", 8192))
+        self.mmap_mb = int(Config.get("MEMORY_DB_MMAP_MB", 64))
+        self.statement_cache = int(Config.get("MEMORY_DB_STATEMENT_CACHE", 256))
+        self.busy_timeout_ms = int(Config.get("MEMORY_DB_BUSY_TIMEOUT_MS", 5000))
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._pool: Optional[asyncio.Queue] = None
+        self._connections: List[aiosqlite.Connection] = []
+        self._open_lock = asyncio.Lock()
+
+        self.writes = 0
+        self.reads = 0
+        self.write_wait = 0.0
+        self.read_wait = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    @staticmethod
+    async def _pragma(db: aiosqlite.Connection, pragma: str) -> None:
+        # Drain the result: an open statement would keep the file locked
+        async with db.execute(f"PRAGMA {pragma}") as cursor:
+            await cursor.fetchall()
+
+    async def _connection(self, read_only: bool) -> aiosqlite.Connection:
+        db = await aiosqlite.connect(
+            self.path,
+            cached_statements=self.statement_cache,
+        )
+        self._connections.append(db)
+
+        await self._pragma(db, f"busy_timeout = {self.busy_timeout_ms}")
+        await self._pragma(db, f"synchronous = {self.synchronous}")
+        # Negative cache_size is in KiB
+        await self._pragma(db, f"cache_size = -{self.cache_kb}")
+        await self._pragma(db, f"mmap_size = {self.mmap_mb * 1024 * 1024}")
+        await self._pragma(db, "temp_store = MEMORY")
+        if read_only:
+            await self._pragma(db, "query_only = ON")
+
+        # decay(importance, age, half_life), for ranking inside queries
+        await db.create_function(
+            "decay", 3, MemoryDecay.decayed, deterministic=True
+        )
+        return db
+
+    async def _close_all(self) -> None:
+        for db in self._connections:
+            with contextlib.suppress(Exception):
+                await db.close()
+
+        self._connections.clear()
+        self._writer = None
+        self._pool = None
+
+    async def open(self) -> None:
+        async with self._open_lock:
+            if self.is_open:
+                return
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            try:
+                writer = await self._connection(read_only=False)
+                # Only takes effect on a new database (before any table);
+                # lets compaction return free pages incrementally
+                await self._pragma(writer, "auto_vacuum = INCREMENTAL")
+                # Persistent: set once on the writer, applies to the file
+                await self._pragma(writer, "journal_mode = WAL")
+
+                pool: asyncio.Queue = asyncio.Queue()
+                for _ in range(max(1, self.readers)):
+                    pool.put_nowait(await self._connection(read_only=True))
+            except BaseException:
+                await self._close_all()
+                raise
+
+            self._pool = pool
+            self._writer = writer
+
+    @contextlib.asynccontextmanager
+    async def write(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Exclusive use of the writer connection for one transaction.
+        Commits on success, rolls back on error.
+        """
+        if not self.is_open:
+            await self.open()
+
+        start = time.perf_counter()
+        async with self._write_lock:
+            self.write_wait += time.perf_counter() - start
+            self.writes += 1
+            try:
+                yield self._writer
+            except BaseException:
+                await self._writer.rollback()
+                raise
+            await self._writer.commit()
+
+    @contextlib.asynccontextmanager
+    async def read(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+        """
+        if not self.is_open:
+            await self.open()
+
+        start = time.perf_counter()
+        db = await self._pool.get()
+        self.read_wait += time.perf_counter() - start
+        self.reads += 1
+        try:
+            yield db
+        finally:
+            self._pool.put_nowait(db)
+
+    async def close(self) -> None:
+        async with self._open_lock:
+            if not self.is_open:
+                return
+
+            async with self._write_lock:
+                with contextlib.suppress(Exception):
+                    await self._pragma(self._writer, "optimize")
+                    await self._pragma(self._writer, "wal_checkpoint(TRUNCATE)")
+
+                await self._close_all()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "open": self.is_open,
+            "readers": self.readers,
+            "readers_idle": self._pool.qsize() if self._pool else 0,
+            "writes": self.writes,
+            "reads": self.reads,
+            "avg_write_wait": self.write_wait / self.writes if self.writes else 0.0,
+            "avg_read_wait": self.read_wait / self.reads if self.reads else 0.0,
+        }
+
+
+# Global singleton shared by all memory stores
+MEMORY_DB = MemoryDatabase()
@@ -1,6 +1,11 @@
+import math
 import time
 
 
+# Importance floor, so log2 stays finite for zero-importance rows
+MIN_IMPORTANCE = 1e-6
+
+
 class MemoryDecay:
     """
     Importance decay over time.
@@ -8,6 +13,24 @@ class MemoryDecay:
 
     @staticmethod
     def apply(importance: float, created_at: float, half_life: float = 86400) -> float:
-        age = time.time() - created_at
-        decay_factor = 0.5 ** (age / half_life)
-        return importance * decay_factor
+        return MemoryDecay.decayed(importance, time.time() - created_at, half_life)
+
+    @staticmethod
+    def decayed(importance: float, age: float, half_life: float) -> float:
+        """
+        Decay by age in seconds. Also registered as the SQL
+        function decay(importance, age, half_life).
+        """
+        return (importance or 0.0) * 0.5 ** (age / half_life)
+
+    @staticmethod
+    def rank_key(importance: float, created_at: float, half_life: float) -> float:
+        """
+        Age-independent sort key: log2(apply(...)) + now / half_life.
+        Ordering by it equals ordering by decayed importance at any
+        moment, so it can be stored and indexed.
+        """
+        return (
+            math.log2(max(importance or 0.0, MIN_IMPORTANCE))
+            + created_at / half_life
+        )
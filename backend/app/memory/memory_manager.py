@@ -1,13 +1,19 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+from app.core.config import Config
 from datetime import datetime
 
 from app.core.encryption import EncryptionManager
 from app.monitoring.logs import log
 
+from .database import MEMORY_DB
+from .write_behind import MEMORY_WRITES
+from .compaction import MEMORY_COMPACTOR
 from .stores.user import UserMemoryStore
 from .stores.server import ServerMemoryStore
 from .stores.emotional import EmotionalMemoryStore
 from .stores.ephemeral import EphemeralMemoryStore
+from .stores.vector import VectorMemoryStore
 from .scoring import ImportanceScorer
 
 
@@ -25,15 +31,27 @@ class MemoryManager:
         self.server = ServerMemoryStore(self.encryptor)
         self.emotional = EmotionalMemoryStore(self.encryptor)
         self.ephemeral = EphemeralMemoryStore()
+        self.vectors = VectorMemoryStore(self.encryptor)
+        MEMORY_COMPACTOR.vectors = self.vectors
 
     async def initialize(self):
         await self.user.init()
         await self.server.init()
         await self.emotional.init()
-        await self.ephemeral.init()
+        await self.vectors.init()
+        MEMORY_WRITES.start()
+        self.vectors.start()
+        MEMORY_COMPACTOR.start()
 
         await log("Memory system initialized")
 
+    async def close(self):
+        await MEMORY_COMPACTOR.stop()
+        await self.vectors.stop()
+        # Flush queued inserts before the connections go away
+        await MEMORY_WRITES.stop()
+        await MEMORY_DB.close()
+
     # -----------------------------
     # WRITE METHODS
     # -----------------------------
@@ -45,7 +63,8 @@ class MemoryManager:
         importance: Optional[float] = None,
     ):
         score = importance or self.scorer.score(content)
-        await self.user.add(user_id, content, score)
+        source = await self.user.add(user_id, content, score)
+        await self.vectors.add("user", user_id, content, source)
 
         await log(
             f"Memory stored: user={user_id}, type=user, importance={score}"
@@ -58,7 +77,8 @@ class MemoryManager:
         importance: Optional[float] = None,
     ):
         score = importance or self.scorer.score(content)
-        await self.server.add(server_id, content, score)
+        source = await self.server.add(server_id, content, score)
+        await self.vectors.add("server", server_id, content, source)
 
         await log(
             f"Memory stored: server={server_id}, type=server, importance={score}"
@@ -93,14 +113,65 @@ class MemoryManager:
     # -----------------------------
 
     async def recall_user(self, user_id: str, limit: int = 10):
-        return await self.user.get(user_id, limit)
+        return await self.user.recall(user_id, limit)
 
     async def recall_server(self, server_id: str, limit: int = 10):
-        return await self.server.get(server_id, limit)
+        return await self.server.recall(server_id, limit)
 
     async def recall_emotions(self, user_id: str, limit: int = 10):
-        return await self.emotional.get(user_id, limit)
+        return await self.emotional.recall(user_id, limit)
+
+    async def recall_relevant(
+        self,
+        scope: str,
+        owner_id: str,
+        prompt: str,
+        limit: Optional[int] = None,
+    ):
+        """
+        Memories most similar to the prompt (vector store), falling back
+        to the top-ranked ones when none are indexed yet.
+        """
+        memory = await self._recall_relevant({scope: owner_id}, prompt, limit)
+        return memory[scope]
+
+    async def recall_context(
+        self,
+        prompt: str,
+        user_id: str,
+        server_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Dict[str, List[Any]]:
+        """
+        recall_relevant for a user (and server) at once, shaped as the
+        `memory` argument of ContextManager.build. The prompt is
+        embedded once for both.
+        """
+        owners = {"user": user_id}
+        if server_id:
+            owners["server"] = server_id
+        return await self._recall_relevant(owners, prompt, limit)
+
+    async def _recall_relevant(
+        self,
+        owners: Dict[str, str],
+        prompt: str,
+        limit: Optional[int],
+    ) -> Dict[str, List[Any]]:
+        limit = limit or int(Config.get("MEMORY_VECTOR_TOP_K", 4))
+
+        found = await self.vectors.recall_many(
+            list(owners.items()), prompt, limit
+        )
 
+        memory = {}
+        for scope, owner_id in owners.items():
+            relevant = found[(scope, owner_id)]
+            if not relevant:
+                store = self.user if scope == "user" else self.server
+                relevant = await store.recall(owner_id, limit)
+            memory[scope] = relevant
+        return memory
 
 # Global singleton (SAFE)
 MEMORY = MemoryManager()
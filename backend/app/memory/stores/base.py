@@ -1,25 +1,228 @@
-import aiosqlite
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from app.core.config import Config
 from app.core.encryption import EncryptionManager
+from app.memory.database import MEMORY_DB, MemoryDatabase
+from app.memory.decay import MemoryDecay
+from app.memory.write_behind import MEMORY_WRITES, WriteBehindQueue
 import json
-import os
-
-
-DB_PATH = os.getenv("MEMORY_DB_PATH", "data/memory.db")
+import time
+import uuid
 
 
 class BaseMemoryStore:
     table_name: str = ""
 
-    def __init__(self, encryptor: EncryptionManager):
+    def __init__(
+        self,
+        encryptor: EncryptionManager,
+        db: MemoryDatabase = MEMORY_DB,
+        writes: WriteBehindQueue = MEMORY_WRITES,
+    ):
         self.encryptor = encryptor
-
-    async def _connect(self):
-        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-        return await aiosqlite.connect(DB_PATH)
+        self.db = db
+        self.writes = writes
 
     async def _serialize(self, data: Dict[str, Any]) -> str:
         return self.encryptor.encrypt(json.dumps(data))
 
     async def _deserialize(self, blob: str) -> Dict[str, Any]:
         return json.loads(self.encryptor.decrypt(blob))
+
+
+class RankedMemoryStore(BaseMemoryStore):
+    """
+    Encrypted memories of one owner (user / server), ranked by
+    importance decayed with age (MemoryDecay, MEMORY_HALF_LIFE).
+
+    - Each row stores rank_key (MemoryDecay.rank_key); the
+      (owner, rank_key) index makes top-k recall an index walk,
+      flat in the owner's history size
+    - Only the rows returned are decrypted
+    - Each row gets a random `source` key that derived rows (e.g. its
+      vector_memory embedding) reference, so they are removed with it
+    """
+
+    owner_column: str = ""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.half_life = float(Config.get("MEMORY_HALF_LIFE", 86400))
+
+    async def init(self):
+        table, owner = self.table_name, self.owner_column
+        async with self.db.write() as db:
+            await db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    {owner} TEXT,
+                    data TEXT,
+                    importance REAL,
+                    created_at REAL,
+                    rank_key REAL,
+                    source TEXT
+                )
+            """)
+
+            # Older tables (and their compaction archive) lack newer columns
+            for name in (table, f"{table}_archive"):
+                async with db.execute(f"PRAGMA table_info({name})") as cursor:
+                    columns = {row[1] for row in await cursor.fetchall()}
+                if not columns:
+                    continue
+                for column, kind in (("rank_key", "REAL"), ("source", "TEXT")):
+                    if column not in columns:
+                        await db.execute(
+                            f"ALTER TABLE {name} ADD COLUMN {column} {kind}"
+                        )
+
+            await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_{owner}_rank
+                ON {table}({owner}, rank_key DESC)
+            """)
+            # Paging walks (owner, rowid)
+            await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_{owner}
+                ON {table}({owner})
+            """)
+
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS memory_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+        await self._rerank()
+
+    async def _rerank(self) -> None:
+        """
+        Fill missing rank keys, or recompute all of them when
+        MEMORY_HALF_LIFE changed since they were written.
+        """
+        table = self.table_name
+        meta_key = f"{table}.half_life"
+
+        async with self.db.write() as db:
+            async with db.execute(
+                "SELECT value FROM memory_meta WHERE key = ?", (meta_key,)
+            ) as cursor:
+                row = await cursor.fetchone()
+
+            stale = row is None or float(row[0]) != self.half_life
+            where = "" if stale else "WHERE rank_key IS NULL"
+
+            async with db.execute(
+                f"SELECT id, importance, created_at FROM {table} {where}"
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            await db.executemany(
+                f"UPDATE {table} SET rank_key = ? WHERE id = ?",
+                [
+                    (
+                        MemoryDecay.rank_key(
+                            importance, created_at or 0.0, self.half_life
+                        ),
+                        row_id,
+                    )
+                    for row_id, importance, created_at in rows
+                ],
+            )
+            await db.execute(
+                "INSERT OR REPLACE INTO memory_meta VALUES (?, ?)",
+                (meta_key, str(self.half_life)),
+            )
+
+    async def add(
+        self,
+        owner: str,
+        data: Dict[str, Any],
+        importance: float,
+    ) -> str:
+        """
+        Queue a memory; returns its source key.
+        """
+        created_at = time.time()
+        source = uuid.uuid4().hex
+        await self.writes.submit(
+            f"INSERT INTO {self.table_name} "
+            f"({self.owner_column}, data, importance, created_at, rank_key, "
+            "source) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                owner,
+                await self._serialize(data),
+                importance,
+                created_at,
+                MemoryDecay.rank_key(importance, created_at, self.half_life),
+                source,
+            ),
+        )
+        return source
+
+    async def fetch(self, owner: str) -> List[Dict[str, Any]]:
+        async with self.db.read() as db:
+            cursor = await db.execute(
+                f"SELECT data FROM {self.table_name} "
+                f"WHERE {self.owner_column} = ?",
+                (owner,),
+            )
+            rows = await cursor.fetchall()
+
+        # Decrypt after handing the connection back to the pool
+        return [await self._deserialize(r[0]) for r in rows]
+
+    async def recall(self, owner: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Top-k memories by decayed importance, best first.
+        """
+        async with self.db.read() as db:
+            cursor = await db.execute(
+                f"SELECT data FROM {self.table_name} "
+                f"WHERE {self.owner_column} = ? "
+                "ORDER BY rank_key DESC LIMIT ?",
+                (owner, k),
+            )
+            rows = await cursor.fetchall()
+
+        return [await self._deserialize(r[0]) for r in rows]
+
+    async def page(
+        self,
+        owner: str,
+        limit: int = 20,
+        before: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Newest-first page of memories with their current decayed score.
+        Pass the returned "next" id as `before` for the following page.
+        """
+        sql = (
+            "SELECT id, data, importance, created_at, "
+            "decay(importance, ? - created_at, ?) "
+            f"FROM {self.table_name} WHERE {self.owner_column} = ?"
+        )
+        params: List[Any] = [time.time(), self.half_life, owner]
+        if before is not None:
+            sql += " AND id < ?"
+            params.append(before)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        async with self.db.read() as db:
+            cursor = await db.execute(sql, params)
+            rows = await cursor.fetchall()
+
+        items = [
+            {
+                "id": row_id,
+                "data": await self._deserialize(blob),
+                "importance": importance,
+                "score": score,
+                "created_at": created_at,
+            }
+            for row_id, blob, importance, created_at, score in rows
+        ]
+        return {
+            "items": items,
+            "next": items[-1]["id"] if len(items) == limit else None,
+        }
@@ -1,5 +1,5 @@
 from .base import BaseMemoryStore
-from typing import Dict, Any
+from typing import Dict, Any, List
 import time
 
 
@@ -7,7 +7,7 @@ class EmotionalMemoryStore(BaseMemoryStore):
     table_name = "emotional_memory"
 
     async def init(self):
-        async with await self._connect() as db:
+        async with self.db.write() as db:
             await db.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self.table_name} (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -17,13 +17,31 @@ class EmotionalMemoryStore(BaseMemoryStore):
                     created_at REAL
                 )
             """)
-            await db.commit()
+            await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.table_name}_user_created
+                ON {self.table_name}(user_id, created_at DESC)
+            """)
 
     async def add(self, user_id: str, emotion: str, intensity: float):
         payload = {"emotion": emotion, "intensity": intensity}
-        async with await self._connect() as db:
-            await db.execute(
-                f"INSERT INTO {self.table_name} VALUES (NULL, ?, ?, ?, ?)",
-                (user_id, emotion, intensity, time.time()),
+        await self.writes.submit(
+            f"INSERT INTO {self.table_name} VALUES (NULL, ?, ?, ?, ?)",
+            (user_id, emotion, intensity, time.time()),
+        )
+
+    async def recall(self, user_id: str, k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Most recent k emotions, newest first.
+        """
+        async with self.db.read() as db:
+            cursor = await db.execute(
+                f"SELECT emotion, intensity, created_at FROM {self.table_name} "
+                "WHERE user_id = ? ORDER BY created_at DESC LIMIT ?",
+                (user_id, k),
             )
-            await db.commit()
+            rows = await cursor.fetchall()
+
+        return [
+            {"emotion": emotion, "intensity": intensity, "created_at": created_at}
+            for emotion, intensity, created_at in rows
+        ]
@@ -0,0 +1,486 @@
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import Config
+from app.monitoring.logs import log
+from .base import BaseMemoryStore
+
+
+def _text(data: Any) -> str:
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict) and "content" in data:
+        return str(data["content"])
+    return json.dumps(data, sort_keys=True)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class _OwnerIndex:
+    """
+    One owner's vectors: a contiguous float32 file, appended on write
+    and memory-mapped for search. Row n is slot n.
+    """
+
+    def __init__(self, path: str, dim: int):
+        self.path = path
+        self.dim = dim
+        self._map: Optional[np.memmap] = None
+        self._rows = 0
+
+    @property
+    def count(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // (self.dim * 4)
+
+    def append(self, vectors: np.ndarray) -> int:
+        """
+        Append rows; returns the slot of the first one.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        first = self.count
+        with open(self.path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        return first
+
+    def matrix(self) -> Optional[np.memmap]:
+        rows = self.count
+        if rows != self._rows:
+            self._map = (
+                np.memmap(self.path, np.float32, "r", shape=(rows, self.dim))
+                if rows else None
+            )
+            self._rows = rows
+        return self._map
+
+
+class VectorMemoryStore(BaseMemoryStore):
+    """
+    Embedding-based recall for user and server memories.
+
+    - Memories are embedded on write through the embeddings engine
+      (MEMORY_EMBED_ENGINE, Ollama /api/embed), batched in the background
+      (MEMORY_EMBED_BATCH texts or MEMORY_EMBED_FLUSH_MS)
+    - Vectors: one contiguous float32 file per owner and embedding model,
+      memory-mapped and searched with a NumPy dot product (rows are
+      L2-normalized, so it is cosine similarity)
+    - A prompt is embedded once per recall, and only when one of the
+      owners asked about has an index; disabled by default
+      (MEMORY_VECTOR_ENABLED)
+    - Text stays encrypted at rest in SQLite, keyed by (owner, slot);
+      only the top-k hits are decrypted
+    - Rows carry the `source` key of the memory they embed; compaction
+      deletes them with it, then rewrite() drops their vectors from the
+      owner's file and renumbers the remaining slots
+    - Search over-fetches MEMORY_VECTOR_OVERFETCH x k candidates, so
+      slots without a row (not committed yet) don't crowd out live ones
+    """
+
+    table_name = "vector_memory"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.enabled = str(
+            Config.get("MEMORY_VECTOR_ENABLED", "false")
+        ).lower() in ("1", "true", "yes")
+        self.directory = Config.get("MEMORY_VECTOR_DIR", "data/vectors")
+        self.engine_id = Config.get("MEMORY_EMBED_ENGINE", "ollama")
+        self.batch = int(Config.get("MEMORY_EMBED_BATCH", 32))
+        self.flush_interval = float(Config.get("MEMORY_EMBED_FLUSH_MS", 100)) / 1000
+        self.min_similarity = float(Config.get("MEMORY_VECTOR_MIN_SIMILARITY", 0.3))
+        self.max_open = int(Config.get("MEMORY_VECTOR_OPEN_MAX", 256))
+        self.overfetch = max(1, int(Config.get("MEMORY_VECTOR_OVERFETCH", 4)))
+
+        self._queue: asyncio.Queue = asyncio.Queue(
+            int(Config.get("MEMORY_EMBED_QUEUE_MAX", 1024))
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._indexes: "OrderedDict[Tuple[str, str, str], _OwnerIndex]" = OrderedDict()
+
+        # Held while files are appended to or rewritten
+        self._files = asyncio.Lock()
+        # Owners being rewritten, and how often each was: a search that
+        # overlaps a rewrite could pair old slots with new rows
+        self._rewriting: set = set()
+        self._rewrites: Dict[Tuple[str, str, str], int] = {}
+
+        self.embedded = 0
+        self.batches = 0
+        self.failed = 0
+        self.searches = 0
+        self.search_seconds: Deque[float] = deque(maxlen=200)
+
+    async def init(self):
+        async with self.db.write() as db:
+            await db.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table_name} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scope TEXT,
+                    owner TEXT,
+                    model TEXT,
+                    slot INTEGER,
+                    data TEXT,
+                    created_at REAL,
+                    source TEXT,
+                    dim INTEGER
+                )
+            """)
+
+            async with db.execute(
+                f"PRAGMA table_info({self.table_name})"
+            ) as cursor:
+                columns = {row[1] for row in await cursor.fetchall()}
+            for column, kind in (("source", "TEXT"), ("dim", "INTEGER")):
+                if column not in columns:
+                    await db.execute(
+                        f"ALTER TABLE {self.table_name} "
+                        f"ADD COLUMN {column} {kind}"
+                    )
+
+            await db.execute(f"""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_{self.table_name}_slot
+                ON {self.table_name}(scope, owner, model, slot)
+            """)
+            # Compaction deletes by source
+            await db.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{self.table_name}_source
+                ON {self.table_name}(source)
+            """)
+
+    def start(self) -> None:
+        if self.enabled and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Embed whatever is still queued, then stop the batcher.
+        """
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        while not self._queue.empty():
+            batch = []
+            while len(batch) < self.batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._embed_batch(batch)
+
+    def _path(self, model: str, scope: str, owner: str) -> str:
+        digest = hashlib.sha256(owner.encode()).hexdigest()[:32]
+        return os.path.join(
+            self.directory,
+            re.sub(r"[^\w.-]", "_", model),
+            scope,
+            f"{digest}.f32",
+        )
+
+    def _indexed(self, model: str, scope: str, owner: str) -> bool:
+        path = self._path(model, scope, owner)
+        return os.path.exists(path) and os.path.getsize(path) > 0
+
+    def _index(self, model: str, scope: str, owner: str, dim: int) -> _OwnerIndex:
+        key = (model, scope, owner)
+        index = self._indexes.get(key)
+        if index is None or index.dim != dim:
+            index = _OwnerIndex(self._path(model, scope, owner), dim)
+            self._indexes[key] = index
+            # Bound open memory maps
+            while len(self._indexes) > self.max_open:
+                self._indexes.popitem(last=False)
+        self._indexes.move_to_end(key)
+        return index
+
+    async def add(
+        self,
+        scope: str,
+        owner: str,
+        data: Any,
+        source: Optional[str] = None,
+    ) -> None:
+        """
+        Queue a memory for embedding (returns before the embedding call).
+        `source` is the key of the stored memory this row embeds.
+        """
+        if not self.enabled:
+            return
+        self.start()
+        await self._queue.put((scope, owner, data, time.time(), source))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.batch - 1:
+                await asyncio.sleep(self.flush_interval)
+            while len(batch) < self.batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            # Shielded: stop() must not lose a batch mid-embedding
+            await asyncio.shield(self._embed_batch(batch))
+
+    async def _model(self) -> Optional[str]:
+        """
+        Current embedding model, without calling the engine.
+        """
+        from app.ai.engine_registry import ENGINE_REGISTRY
+
+        engine = await ENGINE_REGISTRY.get(self.engine_id)
+        if engine is None or not hasattr(engine, "embed"):
+            return None
+        return str(getattr(engine, "embed_model", self.engine_id))
+
+    async def _embed(self, texts: List[str]) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        Returns (embedding model, normalized vectors), or (None, None)
+        when no embeddings engine is available.
+        """
+        # Imported lazily: app.ai is optional for the memory layer
+        from app.ai.engine_registry import ENGINE_REGISTRY
+
+        async with ENGINE_REGISTRY.lease(self.engine_id) as engine:
+            if engine is None or not hasattr(engine, "embed"):
+                return None, None
+            embeddings = await engine.embed(texts)
+            model = str(getattr(engine, "embed_model", self.engine_id))
+
+        if len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"expected {len(texts)} embeddings, got {len(embeddings)}"
+            )
+        return model, _normalize(np.asarray(embeddings, dtype=np.float32))
+
+    async def _embed_batch(
+        self,
+        batch: List[Tuple[str, str, Any, float, Optional[str]]],
+    ) -> None:
+        if not batch:
+            return
+
+        try:
+            model, vectors = await self._embed([_text(item[2]) for item in batch])
+        except Exception as e:
+            self.failed += len(batch)
+            await log(f"Memory embedding failed ({len(batch)} memories): {e}")
+            return
+        if vectors is None:
+            self.failed += len(batch)
+            return
+
+        # Append per owner so each file stays contiguous
+        rows: Dict[Tuple[str, str], List[int]] = {}
+        for i, (scope, owner, _, _, _) in enumerate(batch):
+            rows.setdefault((scope, owner), []).append(i)
+
+        dim = vectors.shape[1]
+        async with self._files:
+            for (scope, owner), positions in rows.items():
+                index = self._index(model, scope, owner, dim)
+                first = index.append(vectors[positions])
+                for offset, i in enumerate(positions):
+                    await self.writes.submit(
+                        f"INSERT INTO {self.table_name} "
+                        "(scope, owner, model, slot, data, created_at, "
+                        "source, dim) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            scope,
+                            owner,
+                            model,
+                            first + offset,
+                            await self._serialize(batch[i][2]),
+                            batch[i][3],
+                            batch[i][4],
+                            dim,
+                        ),
+                    )
+
+        self.embedded += len(batch)
+        self.batches += 1
+
+    async def recall_many(
+        self,
+        owners: List[Tuple[str, str]],
+        prompt: str,
+        k: int = 5,
+    ) -> Dict[Tuple[str, str], List[Any]]:
+        """
+        Top-k memories most similar to `prompt` for each (scope, owner),
+        best first. Empty for owners with nothing indexed, or when
+        embeddings are unavailable.
+        """
+        results: Dict[Tuple[str, str], List[Any]] = {key: [] for key in owners}
+        if not self.enabled or not prompt:
+            return results
+
+        model = await self._model()
+        if model is None:
+            return results
+
+        indexed = [key for key in owners if self._indexed(model, *key)]
+        if not indexed:
+            return results
+
+        try:
+            model, query = await self._embed([prompt])
+        except Exception as e:
+            await log(f"Memory recall embedding failed: {e}")
+            return results
+        if query is None:
+            return results
+
+        for scope, owner in indexed:
+            results[(scope, owner)] = await self._search(
+                model, scope, owner, query[0], k
+            )
+        return results
+
+    async def recall(
+        self,
+        scope: str,
+        owner: str,
+        prompt: str,
+        k: int = 5,
+    ) -> List[Any]:
+        return (await self.recall_many([(scope, owner)], prompt, k))[
+            (scope, owner)
+        ]
+
+    async def _search(
+        self,
+        model: str,
+        scope: str,
+        owner: str,
+        query: np.ndarray,
+        k: int,
+    ) -> List[Any]:
+        key = (model, scope, owner)
+        if key in self._rewriting:
+            return []
+        rewrites = self._rewrites.get(key, 0)
+
+        start = time.perf_counter()
+        matrix = self._index(model, scope, owner, len(query)).matrix()
+        if matrix is None:
+            return []
+
+        sims = matrix @ query
+        top = min(k * self.overfetch, len(sims))
+        best = np.argpartition(-sims, top - 1)[:top]
+        best = best[np.argsort(-sims[best])]
+        slots = [int(s) for s in best if sims[s] >= self.min_similarity]
+
+        self.searches += 1
+        self.search_seconds.append(time.perf_counter() - start)
+        if not slots:
+            return []
+
+        async with self.db.read() as db:
+            cursor = await db.execute(
+                f"SELECT slot, data FROM {self.table_name} "
+                "WHERE scope = ? AND owner = ? AND model = ? "
+                f"AND slot IN ({','.join('?' * len(slots))})",
+                (scope, owner, model, *slots),
+            )
+            found = dict(await cursor.fetchall())
+
+        if key in self._rewriting or self._rewrites.get(key, 0) != rewrites:
+            return []
+
+        # Slots without a row (not committed yet) are skipped
+        return [
+            await self._deserialize(found[slot])
+            for slot in [slot for slot in slots if slot in found][:k]
+        ]
+
+    async def rewrite(self, model: str, scope: str, owner: str) -> int:
+        """
+        Rewrite an owner's vector file with only the slots that still
+        have a row, renumbering them. Returns bytes reclaimed.
+        """
+        key = (model, scope, owner)
+        path = self._path(model, scope, owner)
+
+        async with self._files:
+            # Every appended vector has its row once queued inserts land
+            await self.writes.flush()
+
+            self._rewriting.add(key)
+            self._rewrites[key] = self._rewrites.get(key, 0) + 1
+            self._indexes.pop(key, None)
+            try:
+                return await self._rewrite(path, model, scope, owner)
+            finally:
+                self._rewriting.discard(key)
+
+    async def _rewrite(
+        self,
+        path: str,
+        model: str,
+        scope: str,
+        owner: str,
+    ) -> int:
+        if not os.path.exists(path):
+            return 0
+        size = os.path.getsize(path)
+
+        async with self.db.write() as db:
+            cursor = await db.execute(
+                f"SELECT id, slot, dim FROM {self.table_name} "
+                "WHERE scope = ? AND owner = ? AND model = ? ORDER BY slot",
+                (scope, owner, model),
+            )
+            rows = await cursor.fetchall()
+
+            if not rows:
+                os.remove(path)
+                return size
+
+            dim = rows[0][2]
+            if not dim:
+                # Written before rows recorded their dimension
+                return 0
+
+            vectors = np.fromfile(path, dtype=np.float32).reshape(-1, dim)
+            kept = vectors[[slot for _, slot, _ in rows]]
+            if len(kept) == len(vectors):
+                return 0
+
+            # Ascending slots only ever move down onto freed numbers,
+            # so the unique (scope, owner, model, slot) index holds
+            await db.executemany(
+                f"UPDATE {self.table_name} SET slot = ? WHERE id = ?",
+                [(new, row_id) for new, (row_id, _, _) in enumerate(rows)],
+            )
+            tmp = f"{path}.tmp"
+            kept.tofile(tmp)
+            os.replace(tmp, path)
+
+        return size - os.path.getsize(path)
+
+    def snapshot(self) -> Dict[str, Any]:
+        searches = list(self.search_seconds)
+        return {
+            "enabled": self.enabled,
+            "engine": self.engine_id,
+            "queued": self._queue.qsize(),
+            "embedded": self.embedded,
+            "batches": self.batches,
+            "avg_batch": self.embedded / self.batches if self.batches else 0.0,
+            "failed": self.failed,
+            "searches": self.searches,
+            "avg_search": sum(searches) / len(searches) if searches else 0.0,
+            "open_indexes": len(self._indexes),
+        }
@@ -0,0 +1,160 @@
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import Config
+from app.monitoring.logs import log
+from .database import MEMORY_DB, MemoryDatabase
+
+
+_Row = Tuple[str, Sequence[Any]]
+
+
+class WriteBehindQueue:
+    """
+    Group-commit queue for memory inserts.
+
+    - add/remember calls enqueue a row and return without touching disk
+    - A background worker commits queued rows from every store in one
+      transaction, every MEMORY_WRITE_FLUSH_MS or MEMORY_WRITE_BATCH_ROWS
+      rows, whichever comes first
+    - Bounded (MEMORY_WRITE_QUEUE_MAX): when full, callers wait for
+      room (backpressure) instead of growing memory
+    - stop() flushes everything still queued
+    - Rows are visible to reads once their batch commits
+    - MEMORY_WRITE_BEHIND=false writes inline instead
+    """
+
+    def __init__(self, db: MemoryDatabase = MEMORY_DB):
+        self.db = db
+        self.enabled = str(
+            Config.get("MEMORY_WRITE_BEHIND", "true")
+        ).lower() in ("1", "true", "yes")
+        self.batch_rows = int(Config.get("MEMORY_WRITE_BATCH_ROWS", 64))
+        self.flush_interval = float(Config.get("MEMORY_WRITE_FLUSH_MS", 50)) / 1000
+        self.capacity = int(Config.get("MEMORY_WRITE_QUEUE_MAX", 2048))
+
+        self._queue: asyncio.Queue = asyncio.Queue(self.capacity)
+        self._task: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+
+        self.rows = 0
+        self.batches = 0
+        self.failed = 0
+        self.blocked = 0
+        self.max_batch = 0
+        self.batch_sizes: Deque[int] = deque(maxlen=200)
+        self.flush_latency: Deque[float] = deque(maxlen=200)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, sql: str, params: Sequence[Any]) -> None:
+        """
+        Queue one row for the next group commit.
+        """
+        if not self.enabled:
+            async with self.db.write() as db:
+                await db.execute(sql, params)
+            return
+
+        self.start()
+        if self._queue.full():
+            self.blocked += 1
+        await self._queue.put((sql, params))
+        if self._queue.qsize() >= self.batch_rows - 1:
+            self._full.set()
+
+    async def _collect(self) -> List[_Row]:
+        batch = [await self._queue.get()]
+
+        # Wait out the interval unless a full batch is already queued.
+        # (Waiting on the event, not queue.get, so a timeout never drops a row.)
+        if self._queue.qsize() < self.batch_rows - 1:
+            self._full.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._full.wait(), self.flush_interval)
+
+        while len(batch) < self.batch_rows and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _commit(self, batch: List[_Row]) -> None:
+        # One executemany per distinct statement (i.e. per store)
+        groups: Dict[str, List[Sequence[Any]]] = {}
+        for sql, params in batch:
+            groups.setdefault(sql, []).append(params)
+
+        start = time.perf_counter()
+        try:
+            async with self.db.write() as db:
+                for sql, rows in groups.items():
+                    await db.executemany(sql, rows)
+        except Exception as e:
+            self.failed += len(batch)
+            await log(f"Memory write batch failed ({len(batch)} rows): {e}")
+            return
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+
+        self.flush_latency.append(time.perf_counter() - start)
+        self.batch_sizes.append(len(batch))
+        self.max_batch = max(self.max_batch, len(batch))
+        self.batches += 1
+        self.rows += len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            # Shielded: a stop() mid-commit must not lose the batch
+            await asyncio.shield(self._commit(batch))
+
+    async def flush(self) -> None:
+        """
+        Wait until every row queued so far is committed.
+        """
+        if self._task is not None and not self._task.done():
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        await self.flush()
+
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        # Worker gone (or never started): commit leftovers directly
+        leftovers = []
+        while not self._queue.empty():
+            leftovers.append(self._queue.get_nowait())
+        if leftovers:
+            await self._commit(leftovers)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latency = sorted(self.flush_latency)
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize(),
+            "capacity": self.capacity,
+            "rows": self.rows,
+            "batches": self.batches,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "avg_batch": (
+                sum(self.batch_sizes) / len(self.batch_sizes)
+                if self.batch_sizes else 0.0
+            ),
+            "max_batch": self.max_batch,
+            "avg_flush": sum(latency) / len(latency) if latency else 0.0,
+            "p95_flush": latency[int(len(latency) * 0.95)] if latency else 0.0,
+        }
+
+
+# Global singleton: every memory store enqueues here
+MEMORY_WRITES = WriteBehindQueue()
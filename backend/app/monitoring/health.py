@@ -1,11 +1,17 @@
-from app.ai.engine_registry import ENGINE_REGISTRY
+async def health_check(refresh: bool = False):
+    """
+    Cached engine health from the background prober.
+    Pass refresh=True to force a parallel probe of every engine.
+    """
+    # Imported lazily: app.ai imports app.monitoring.logs at load time
+    from app.ai.health_prober import HEALTH_PROBER
 
-async def health_check():
-    engines = await ENGINE_REGISTRY.list()
-    status = {}
-    for name, engine in engines.items():
-        try:
-            status[name] = await engine.health_check()
-        except Exception:
-            status[name] = False
-    return {"status": "ok", "engines": status}
+    if refresh:
+        status = await HEALTH_PROBER.probe_all()
+    else:
+        status = HEALTH_PROBER.snapshot()
+    return {
+        "status": "ok",
+        "engines": {name: s["healthy"] for name, s in status.items()},
+        "details": status,
+    }
@@ -1,11 +1,14 @@
-from app.ai.engine_registry import ENGINE_REGISTRY
-
 async def collect_engine_metrics():
+    # Imported lazily: app.ai imports app.monitoring.logs at load time
+    from app.ai.engine_registry import ENGINE_REGISTRY
+    from app.ai.response_cache import RESPONSE_CACHE
+
     engines = await ENGINE_REGISTRY.list()
     data = {}
     for name, engine in engines.items():
         try:
             data[name] = engine.metrics()
+            data[name]["cache"] = RESPONSE_CACHE.engine_stats(name)
         except Exception as e:
             data[name] = {"error": str(e)}
     return data
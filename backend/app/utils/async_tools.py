@@ -1,5 +1,5 @@
 """
-Async Utilities (RESERVED)
+Async Utilities
 
 Purpose:
 - Shared async helpers used across the system
@@ -7,17 +7,31 @@ Purpose:
   - background task scheduling
   - async retry helpers
   - cancellation-safe wrappers
-
-Status:
-- Reserved for future use
-- Not currently imported
-- SAFE to leave unused
+  - offloading blocking calls (sync SDKs) off the event loop
 
 Do NOT delete.
 """
 
 import asyncio
-from typing import Awaitable, Callable
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+)
+
+from app.core.config import Config
+
+
+_END = object()
 
 
 async def run_background(coro: Awaitable) -> None:
@@ -43,3 +57,162 @@ async def retry(
             if attempt == retries - 1:
                 raise
             await asyncio.sleep(delay)
+
+
+class ExecutorFull(RuntimeError):
+    """
+    Raised when the blocking executor's queue is at capacity.
+    """
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for blocking calls.
+
+    - At most ASYNC_EXECUTOR_WORKERS calls run at once
+    - At most ASYNC_EXECUTOR_MAX_QUEUE calls wait; beyond that, ExecutorFull
+    - Timeouts / cancellation drop calls that have not started yet;
+      a call already running is abandoned (threads can't be interrupted)
+    - Tracks queue depth, running calls and queue wait time
+    """
+
+    def __init__(self):
+        self.workers = int(Config.get("ASYNC_EXECUTOR_WORKERS", 8))
+        self.max_queue = int(Config.get("ASYNC_EXECUTOR_MAX_QUEUE", 64))
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.abandoned = 0
+        self.waits: Deque[float] = deque(maxlen=200)
+
+    def _executor(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="blocking",
+            )
+        return self._pool
+
+    def _wrap(self, fn: Callable, args, kwargs) -> Callable[[], Any]:
+        submitted = time.perf_counter()
+
+        def call():
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.waits.append(time.perf_counter() - submitted)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        return call
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Run `fn(*args, **kwargs)` in the pool and await its result.
+        """
+        with self._lock:
+            # Bound the total so a call racing a worker start is not rejected
+            if self.queued + self.running >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorFull(
+                    f"Blocking executor queue full ({self.max_queue})"
+                )
+            self.queued += 1
+
+        future = self._executor().submit(self._wrap(fn, args, kwargs))
+
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout,
+            )
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            # wrap_future propagates the cancel: unstarted calls never run
+            with self._lock:
+                if isinstance(e, asyncio.TimeoutError):
+                    self.timeouts += 1
+                if future.cancelled():
+                    self.queued -= 1
+                    self.cancelled += 1
+                else:
+                    self.abandoned += 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    async def iterate(
+        self,
+        iterable: Iterable,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Consume a blocking iterator (e.g. a sync streaming response),
+        pulling each item in the pool. `timeout` applies per item.
+        """
+        iterator = await self.run(iter, iterable, timeout=timeout)
+        while True:
+            item = await self.run(next, iterator, _END, timeout=timeout)
+            if item is _END:
+                return
+            yield item
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled,
+            "abandoned": self.abandoned,
+            "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+            "p95_wait": waits[int(len(waits) * 0.95)] if waits else 0.0,
+        }
+
+
+# Shared pool for every blocking SDK call
+BLOCKING_EXECUTOR = BlockingExecutor()
+
+
+async def run_blocking(
+    fn: Callable,
+    *args,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> Any:
+    """
+    Run a blocking callable off the event loop via BLOCKING_EXECUTOR.
+    """
+    return await BLOCKING_EXECUTOR.run(fn, *args, timeout=timeout, **kwargs)
@@ -17,12 +17,14 @@ from fastapi import FastAPI
 # ==================================================
 from app.discord import DiscordBot
 from app.core.config import Config
-from app.memory import MEMORY  # imported but NOT re-initialized
+from app.memory import MEMORY
 
 from app.ai.engines.cloud import register_cloud_engines
 from app.ai.engine_router import ENGINE_ROUTER
 from app.ai.engines.ollama.engine import OllamaEngine
 from app.ai.engine_registry import ENGINE_REGISTRY
+from app.ai.health_prober import HEALTH_PROBER
+from app.utils.async_tools import BLOCKING_EXECUTOR
 
 from app.dashboard import dashboard_api, websocket_endpoint
 from app.dashboard.ws import start_dashboard_ws
@@ -67,13 +69,14 @@ async def on_startup():
     print("[startup] Loading configuration")
     Config.load()
 
-    # ---- MEMORY already initialized at import time ----
+    print("[startup] Opening memory database")
+    await MEMORY.initialize()
 
     print("[startup] Registering AI engines")
     await ENGINE_REGISTRY.register(OllamaEngine())
 
     try:
-        register_cloud_engines()
+        await register_cloud_engines()
     except Exception as e:
         print("[ai][warn] Cloud engine registration failed:", e)
 
@@ -81,6 +84,9 @@ async def on_startup():
     await ENGINE_ROUTER.set_active("ollama")
     await ENGINE_ROUTER.set_fallback("openai")
 
+    print("[startup] Starting engine health prober")
+    HEALTH_PROBER.start()
+
     print("[startup] Starting dashboard websocket")
     asyncio.create_task(start_dashboard_ws())
 
@@ -90,6 +96,27 @@ async def on_startup():
     print("[startup] Application startup complete")
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    print("[shutdown] Stopping engine health prober")
+    await HEALTH_PROBER.stop()
+
+    print("[shutdown] Shutting down AI engines")
+    engines = await ENGINE_REGISTRY.list()
+    for engine_id, engine in engines.items():
+        try:
+            # Closes pooled HTTP clients and keep-alive / residency tasks
+            await engine.shutdown()
+        except Exception as e:
+            print(f"[shutdown][warn] {engine_id} shutdown failed:", e)
+
+    print("[shutdown] Closing memory database")
+    await MEMORY.close()
+
+    print("[shutdown] Stopping blocking executor")
+    BLOCKING_EXECUTOR.shutdown()
+
+
 # ==================================================
 # ENTRYPOINT
 # ==================================================
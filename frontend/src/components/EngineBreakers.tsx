@@ -0,0 +1,18 @@
+import { useDashboard } from "../state/store";
+
+export default function EngineBreakers() {
+  const { state } = useDashboard();
+  if (!state?.breakers) return null;
+
+  return (
+    <div>
+      <h2 className="font-semibold">Circuit Breakers</h2>
+      {Object.entries(state.breakers).map(([engine, b]: [string, any]) => (
+        <p key={engine}>
+          {engine}: {b.state} ({Math.round(b.failure_rate * 100)}% failures,{" "}
+          {b.trips} trips)
+        </p>
+      ))}
+    </div>
+  );
+}
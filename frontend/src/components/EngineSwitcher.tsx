@@ -7,8 +7,16 @@ export default function EngineSwitcher() {
   return (
     <div>
       <h2 className="font-semibold">AI Engines</h2>
+      <p className="text-sm opacity-70">
+        Routing: {state.routing_mode ?? "fixed"}
+      </p>
       {state.engines.map(e => (
-        <button key={e} className="mr-2 px-3 py-1 bg-blue-600 rounded">
+        <button
+          key={e}
+          className={`mr-2 px-3 py-1 rounded ${
+            e === state.active_engine ? "bg-blue-600" : "bg-gray-700"
+          }`}
+        >
           {e}
         </button>
       ))}
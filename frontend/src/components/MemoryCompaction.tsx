@@ -0,0 +1,29 @@
+import { useDashboard } from "../state/store";
+
+export default function MemoryCompaction() {
+  const { state } = useDashboard();
+  if (!state?.compaction) return null;
+
+  const c = state.compaction;
+  const last = c.last;
+
+  return (
+    <div>
+      <h2 className="font-semibold">Memory Compaction</h2>
+      {last ? (
+        <p>
+          Last run: {last.decayed} decayed, {last.capped} over cap,{" "}
+          {(last.bytes_reclaimed / 1024).toFixed(0)} KiB reclaimed in{" "}
+          {last.seconds.toFixed(2)}s
+        </p>
+      ) : (
+        <p>No run yet (every {c.interval}s)</p>
+      )}
+      <p>
+        Total: {c.totals.decayed + c.totals.capped} rows pruned,{" "}
+        {(c.totals.bytes_reclaimed / 1024).toFixed(0)} KiB reclaimed over{" "}
+        {c.runs} runs{c.running ? " (running)" : ""}
+      </p>
+    </div>
+  );
+}
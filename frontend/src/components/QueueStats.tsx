@@ -0,0 +1,19 @@
+import { useDashboard } from "../state/store";
+
+export default function QueueStats() {
+  const { state } = useDashboard();
+  if (!state?.scheduler) return null;
+
+  return (
+    <div>
+      <h2 className="font-semibold">Generation Queue</h2>
+      {Object.entries(state.scheduler).map(([engine, q]: [string, any]) => (
+        <p key={engine}>
+          {engine}: {q.running}/{q.limit} running, {q.queued} queued, wait{" "}
+          {q.avg_wait.toFixed(2)}s avg / {q.p95_wait.toFixed(2)}s p95, {q.shed}{" "}
+          shed
+        </p>
+      ))}
+    </div>
+  );
+}
@@ -2,6 +2,9 @@ import { useDashboard } from "../state/store";
 import EngineSwitcher from "../components/EngineSwitcher";
 import MoodControl from "../components/MoodControl";
 import HardwareStats from "../components/HardwareStats";
+import EngineBreakers from "../components/EngineBreakers";
+import QueueStats from "../components/QueueStats";
+import MemoryCompaction from "../components/MemoryCompaction";
 import LogsViewer from "../components/LogsViewer";
 
 export default function Dashboard() {
@@ -13,6 +16,9 @@ export default function Dashboard() {
       <h1 className="text-2xl font-bold">Dashboard</h1>
       <EngineSwitcher />
       <MoodControl />
+      <EngineBreakers />
+      <QueueStats />
+      <MemoryCompaction />
       <HardwareStats />
       <LogsViewer />
     </div>
@@ -3,6 +3,7 @@ import { createContext, useContext, useState } from "react";
 export type DashboardState = {
   engines: string[];
   active_engine: string | null;
+  routing_mode?: "fixed" | "adaptive";
   cloud: {
     openai: boolean;
     gemini: boolean;
@@ -15,6 +16,9 @@ export type DashboardState = {
   plugins: string[];
   hardware?: any;
   metrics?: any;
+  breakers?: Record<string, any>;
+  scheduler?: Record<string, any>;
+  compaction?: Record<string, any>;
   logs?: string[];
 };
 
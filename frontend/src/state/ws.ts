@@ -15,7 +15,21 @@ export function useDashboardWS() {
       }
 
       if (msg.type === "engine.switch") {
-        setState((s: any) => ({ ...s, active_engine: msg.engine }));
+        setState((s: any) => ({
+          ...s,
+          active_engine: msg.engine,
+          routing_mode: msg.mode,
+        }));
+      }
+
+      if (msg.type === "engine.breaker") {
+        setState((s: any) => ({
+          ...s,
+          breakers: {
+            ...s.breakers,
+            [msg.engine]: { ...s.breakers?.[msg.engine], state: msg.state },
+          },
+        }));
       }
 
       if (msg.type === "mood.update") {
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Microbenchmark: ENGINE_REGISTRY / STATE read paths under many
+concurrent messages.
+
+Compares the copy-on-write registry and state manager against the
+previous single-lock versions (reproduced below as the baseline).
+Each simulated message does what a generation does on the hot path:
+registry get + list, and a couple of state reads. A background writer
+keeps updating state and re-registering engines meanwhile.
+
+Usage (from the repo root):
+    python scripts/bench_read_paths.py [--messages 20000] [--concurrency 500]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "backend"))
+
+from app.ai.engine_registry import EngineRegistry  # noqa: E402
+from app.core.state_manager import StateManager  # noqa: E402
+
+
+ENGINE_IDS = ("ollama", "openai", "gemini", "local-a", "local-b", "local-c")
+
+
+class _Engine:
+    def __init__(self, engine_id):
+        self.engine_id = engine_id
+
+    async def start(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+class LockedRegistry:
+    """
+    Baseline: one asyncio.Lock around every read, list() copies.
+    """
+
+    def __init__(self):
+        self._engines = {}
+        self._lock = asyncio.Lock()
+
+    async def register(self, engine):
+        async with self._lock:
+            self._engines[engine.engine_id] = engine
+
+    async def get(self, engine_id):
+        async with self._lock:
+            return self._engines.get(engine_id)
+
+    async def list(self):
+        async with self._lock:
+            return dict(self._engines)
+
+
+class LockedState:
+    """
+    Baseline: one asyncio.Lock shared by every namespace.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._state = defaultdict(dict)
+
+    async def get(self, namespace, key, default=None):
+        async with self._lock:
+            return self._state[namespace].get(key, default)
+
+    async def set(self, namespace, key, value):
+        async with self._lock:
+            self._state[namespace][key] = value
+
+
+async def _run(registry, state, messages, concurrency):
+    for engine_id in ENGINE_IDS:
+        await registry.register(_Engine(engine_id))
+    await state.set("ai", "active_engine", "ollama")
+
+    latencies = []
+    done = asyncio.Event()
+    queue = iter(range(messages))
+
+    async def message_worker():
+        for i in queue:
+            start = time.perf_counter()
+            engines = await registry.list()
+            await registry.get(ENGINE_IDS[i % len(ENGINE_IDS)])
+            await state.get("ai", "active_engine")
+            await state.get(f"guild:{i % 50}", "mood")
+            latencies.append(time.perf_counter() - start)
+            assert engines
+            # Yield like a real request awaiting its engine
+            await asyncio.sleep(0)
+
+    async def writer():
+        n = 0
+        while not done.is_set():
+            await state.set(f"guild:{n % 50}", "mood", n)
+            if n % 100 == 0:
+                await registry.register(_Engine(ENGINE_IDS[n % len(ENGINE_IDS)]))
+            n += 1
+            await asyncio.sleep(0)
+
+    writer_task = asyncio.create_task(writer())
+    start = time.perf_counter()
+    await asyncio.gather(*(message_worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await writer_task
+
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "throughput": messages / elapsed,
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+    }
+
+
+def _report(name, result):
+    print(
+        f"{name:<16} {result['elapsed']:>8.3f}s "
+        f"{result['throughput']:>12,.0f} msg/s "
+        f"p50 {result['p50_us']:>8.1f}us  p99 {result['p99_us']:>8.1f}us"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=500)
+    args = parser.parse_args()
+
+    print(
+        f"{args.messages} messages, {args.concurrency} concurrent, "
+        f"{len(ENGINE_IDS)} engines\n"
+    )
+    baseline = await _run(
+        LockedRegistry(), LockedState(), args.messages, args.concurrency
+    )
+    _report("locked", baseline)
+
+    registry = EngineRegistry()
+    cow = await _run(registry, StateManager(), args.messages, args.concurrency)
+    _report("copy-on-write", cow)
+
+    print(f"\nspeedup: {cow['throughput'] / baseline['throughput']:.2f}x")
+
+    # Let retired engines drain before the loop closes
+    await asyncio.sleep(0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())